@@ -0,0 +1,246 @@
+"""
+Severity-aware admission control and load shedding.
+
+Requests get a priority class from their endpoint; symptom texts sent to
+the triage endpoints that hit high-severity SymptomProcessor categories are
+promoted to CRITICAL. At most
+`max_concurrent` requests run at once. The rest wait in bounded per-class
+queues and are admitted highest priority first. Low-priority work is shed
+early: with 429 when its queue is full, and with 503 when its predicted or
+actual queue time exceeds the class's queue-time SLO.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from flask import g, jsonify, request
+
+CRITICAL, HIGH, NORMAL, LOW = 0, 1, 2, 3
+PRIORITY_NAMES = {CRITICAL: 'critical', HIGH: 'high', NORMAL: 'normal', LOW: 'low'}
+
+# Endpoint priority classes; anything not listed is NORMAL
+ENDPOINT_PRIORITIES = {
+    '/api/advanced-predict': HIGH,
+    '/api/risk-assessment': HIGH,
+    '/api/treatment-protocol': NORMAL,
+    '/api/similar-cases': NORMAL,
+    '/api/feedback': NORMAL,
+    '/api/normalize-symptoms': NORMAL,
+    '/api/bulk-predict': LOW,
+    '/api/bulk-risk-assessment': LOW,
+    '/api/model-performance': LOW,
+    '/api/health-analytics': LOW
+}
+
+# SymptomProcessor categories that promote a request to CRITICAL
+HIGH_SEVERITY_CATEGORIES = ('cardiovascular', 'respiratory')
+
+# Triage endpoints whose symptom texts may be promoted; dashboards, feedback
+# and bulk jobs keep their class whatever their payload says
+PROMOTABLE_ENDPOINTS = ('/api/advanced-predict', '/api/risk-assessment')
+
+# Endpoints that must never be queued or shed
+EXEMPT_ENDPOINTS = ('/api/admission/stats', '/api/profiler', '/api/profiler/collapsed', '/api/profiler/export')
+
+class _Waiter:
+    __slots__ = ('event', 'granted', 'cancelled')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+class AdmissionController:
+    """Bounded priority queues in front of a fixed number of execution slots"""
+
+    def __init__(self, max_concurrent=8, queue_limits=None, queue_slo_ms=None, text_normalizer=None,
+                 promotable_endpoints=PROMOTABLE_ENDPOINTS):
+        self.max_concurrent = max_concurrent
+        self.promotable_endpoints = frozenset(promotable_endpoints)
+        self.queue_limits = queue_limits or {CRITICAL: 256, HIGH: 128, NORMAL: 64, LOW: 32}
+        self.queue_slo_ms = queue_slo_ms or {CRITICAL: 10000, HIGH: 3000, NORMAL: 1000, LOW: 250}
+        self.text_normalizer = text_normalizer
+        self._symptom_processor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._heap = []
+        self._queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self._sequence = itertools.count()
+        # Exponentially weighted mean service time per class, used to predict
+        # queue time; kept per class so long LOW streams don't inflate HIGH estimates
+        self._service_ms = {priority: 50.0 for priority in PRIORITY_NAMES}
+        self._stats = {
+            priority: {'admitted': 0, 'queued': 0, 'promoted': 0, 'shed_429': 0, 'shed_503': 0,
+                       'queue_ms': deque(maxlen=1000)}
+            for priority in PRIORITY_NAMES
+        }
+
+    def classify(self, path, payload=None):
+        """Return (priority, promoted) for a request path and its JSON payload"""
+        priority = ENDPOINT_PRIORITIES.get(path, NORMAL)
+        if path not in self.promotable_endpoints:
+            return priority, False
+        symptoms = payload.get('symptoms') if isinstance(payload, dict) else None
+        if priority > CRITICAL and isinstance(symptoms, str) and symptoms:
+            if self._symptom_processor is None:
+                from models.medical_ai import SymptomProcessor
+                self._symptom_processor = SymptomProcessor()
+            if self.text_normalizer is not None:
+                symptoms = self.text_normalizer(symptoms)
+            categories = self._symptom_processor.categorize_symptoms(symptoms)
+            if any(category in categories for category in HIGH_SEVERITY_CATEGORIES):
+                return CRITICAL, True
+        return priority, False
+
+    def _predicted_wait_ms(self, priority):
+        """Queue time estimate from the work queued at the same or higher priority"""
+        ahead_ms = sum(count * self._service_ms[p] for p, count in self._queued.items() if p <= priority)
+        return (ahead_ms + self._service_ms[priority]) / self.max_concurrent
+
+    def acquire(self, priority):
+        """
+        Wait for an execution slot. Returns (status, queue_ms) where status is
+        None when admitted, or 429/503 when the request was shed.
+        """
+        stats = self._stats[priority]
+        start = time.perf_counter()
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not any(self._queued.values()):
+                self._in_flight += 1
+                stats['admitted'] += 1
+                stats['queue_ms'].append(0.0)
+                return None, 0.0
+            if self._queued[priority] >= self.queue_limits[priority]:
+                stats['shed_429'] += 1
+                return 429, 0.0
+            if self._predicted_wait_ms(priority) > self.queue_slo_ms[priority]:
+                stats['shed_503'] += 1
+                return 503, 0.0
+
+            waiter = _Waiter()
+            heapq.heappush(self._heap, (priority, next(self._sequence), waiter))
+            self._queued[priority] += 1
+            stats['queued'] += 1
+
+        waiter.event.wait(self.queue_slo_ms[priority] / 1000)
+        queue_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            if not waiter.granted:
+                # Timed out; the heap entry is skipped lazily when it surfaces
+                waiter.cancelled = True
+                self._queued[priority] -= 1
+                stats['shed_503'] += 1
+                return 503, queue_ms
+            stats['admitted'] += 1
+            stats['queue_ms'].append(queue_ms)
+        return None, queue_ms
+
+    def release(self, priority, service_ms):
+        """Free a slot and hand it to the highest-priority live waiter"""
+        with self._lock:
+            self._service_ms[priority] = 0.9 * self._service_ms[priority] + 0.1 * service_ms
+            while self._heap:
+                priority, _, waiter = heapq.heappop(self._heap)
+                if waiter.cancelled:
+                    continue
+                self._queued[priority] -= 1
+                waiter.granted = True
+                waiter.event.set()
+                return
+            self._in_flight -= 1
+
+    def record_promotion(self, priority):
+        with self._lock:
+            self._stats[priority]['promoted'] += 1
+
+    def get_stats(self):
+        """Per-class admission, shedding and queue-time metrics"""
+        with self._lock:
+            classes = {}
+            for priority, stats in self._stats.items():
+                queue_ms = sorted(stats['queue_ms'])
+                classes[PRIORITY_NAMES[priority]] = {
+                    'admitted': stats['admitted'],
+                    'queued': stats['queued'],
+                    'promoted': stats['promoted'],
+                    'shed_429': stats['shed_429'],
+                    'shed_503': stats['shed_503'],
+                    'waiting': self._queued[priority],
+                    'queue_limit': self.queue_limits[priority],
+                    'queue_slo_ms': self.queue_slo_ms[priority],
+                    'mean_service_ms': round(self._service_ms[priority], 2),
+                    'queue_ms_p50': round(queue_ms[len(queue_ms) // 2], 2) if queue_ms else 0.0,
+                    'queue_ms_p95': round(queue_ms[min(len(queue_ms) - 1, int(len(queue_ms) * 0.95))], 2) if queue_ms else 0.0
+                }
+            return {
+                'in_flight': self._in_flight,
+                'max_concurrent': self.max_concurrent,
+                'classes': classes
+            }
+
+def init_admission_control(app, text_normalizer=None):
+    """Install the admission controller as before/teardown request hooks"""
+    config = app.config
+    controller = AdmissionController(
+        max_concurrent=config.get('ADMISSION_MAX_CONCURRENT', 8),
+        queue_limits=config.get('ADMISSION_QUEUE_LIMITS'),
+        queue_slo_ms=config.get('ADMISSION_QUEUE_SLO_MS'),
+        text_normalizer=text_normalizer,
+        promotable_endpoints=config.get('ADMISSION_PROMOTABLE_ENDPOINTS', PROMOTABLE_ENDPOINTS)
+    )
+    app.extensions['admission_controller'] = controller
+
+    @app.before_request
+    def admit_request():
+        if request.path in EXEMPT_ENDPOINTS or not request.path.startswith('/api/'):
+            return None
+
+        payload = request.get_json(silent=True) if request.is_json else None
+        priority, promoted = controller.classify(request.path, payload)
+        if promoted:
+            controller.record_promotion(priority)
+
+        status, queue_ms = controller.acquire(priority)
+        if status is not None:
+            response = jsonify({
+                'error': 'Server overloaded, request shed',
+                'priority': PRIORITY_NAMES[priority],
+                'queue_ms': round(queue_ms, 2)
+            })
+            response.status_code = status
+            response.headers['Retry-After'] = '1'
+            return response
+
+        g.admission_priority = priority
+        g.admission_started = time.perf_counter()
+        return None
+
+    def release(priority, started):
+        controller.release(priority, (time.perf_counter() - started) * 1000)
+
+    @app.after_request
+    def release_on_close(response):
+        # Streamed bodies are produced after teardown, so hold the slot until
+        # the server closes the response
+        started = g.pop('admission_started', None)
+        if started is not None:
+            priority = g.pop('admission_priority')
+            response.call_on_close(lambda: release(priority, started))
+        return response
+
+    @app.teardown_request
+    def release_request(exc=None):
+        # Fallback for requests that ended without a response reaching after_request
+        started = g.pop('admission_started', None)
+        if started is not None:
+            release(g.pop('admission_priority'), started)
+
+    @app.route('/api/admission/stats', methods=['GET'])
+    def admission_stats():
+        return jsonify(controller.get_stats())
+
+    return controller
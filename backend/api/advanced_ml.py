@@ -1,55 +1,145 @@
 
-import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import joblib
+# numpy and scikit-learn are imported inside the functions that train models so that
+# importing this module (and every route that uses it) stays cheap
 from datetime import datetime
+import hashlib
+import json
+import os
+import threading
 import warnings
+from api.profiler import profile_stage
 warnings.filterwarnings('ignore')
 
+# Synthetic medical training data (symptom description, condition) pairs
+SYMPTOMS_DATA = [
+    "fever headache cough fatigue", "Common Cold",
+    "chest pain shortness of breath dizziness", "Heart Disease",
+    "fever cough fatigue body aches chills", "Influenza",
+    "persistent cough weight loss night sweats", "Tuberculosis",
+    "high blood pressure headache dizziness", "Hypertension",
+    "frequent urination excessive thirst weight loss", "Diabetes",
+    "severe headache nausea vomiting sensitivity light", "Migraine",
+    "joint pain swelling stiffness morning", "Arthritis",
+    "stomach pain nausea diarrhea vomiting", "Gastroenteritis",
+    "skin rash itching redness swelling", "Allergic Reaction",
+    "sore throat fever swollen glands", "Strep Throat",
+    "runny nose sneezing congestion", "Common Cold",
+    "chest tightness wheezing cough", "Asthma",
+    "back pain muscle aches stiffness", "Muscle Strain",
+    "bloating abdominal pain gas", "Digestive Issues"
+]
+
+# Ensemble members that support incremental updates via partial_fit,
+# mapped to the number of warm-up passes over the initial training data
+ONLINE_MODELS = {
+    'naive_bayes': 1,
+    'sgd_classifier': 20
+}
+
+# Constructor arguments for each ensemble member
+MODEL_DEFAULTS = {
+    'random_forest': {'n_estimators': 100, 'random_state': 42},
+    'gradient_boost': {'n_estimators': 100, 'random_state': 42},
+    'logistic_regression': {'random_state': 42, 'max_iter': 1000},
+    'naive_bayes': {'alpha': 0.1},
+    'sgd_classifier': {'loss': 'log_loss', 'random_state': 42}
+}
+
+# TfidfVectorizer arguments shared by training and evaluation
+VECTORIZER_PARAMS = {'stop_words': 'english', 'max_features': 1000}
+
+def build_model(name, **params):
+    """Create an untrained ensemble member, overriding default parameters"""
+    from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.naive_bayes import MultinomialNB
+    
+    model_classes = {
+        'random_forest': RandomForestClassifier,
+        'gradient_boost': GradientBoostingClassifier,
+        'logistic_regression': LogisticRegression,
+        'naive_bayes': MultinomialNB,
+        'sgd_classifier': SGDClassifier
+    }
+    return model_classes[name](**{**MODEL_DEFAULTS[name], **params})
+
+def fit_model(name, model, X, y, classes):
+    """Fit an ensemble member; online members are warmed up with partial_fit"""
+    if name in ONLINE_MODELS:
+        # Online members must know every label up front for partial_fit
+        model.partial_fit(X, y, classes=classes)
+        for _ in range(ONLINE_MODELS[name] - 1):
+            model.partial_fit(X, y)
+    else:
+        model.fit(X, y)
+    return model
+
+def training_fingerprint(model_params=None):
+    """Identify the base training setup so a cached ensemble is only reused when it matches"""
+    import sklearn
+    payload = [SYMPTOMS_DATA, MODEL_DEFAULTS, VECTORIZER_PARAMS, model_params or {}, sklearn.__version__]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_training_data(extra_samples=None):
+    """Return symptom texts and labels, optionally extended with feedback samples"""
+    X = []
+    y = []
+    for i in range(0, len(SYMPTOMS_DATA), 2):
+        X.append(SYMPTOMS_DATA[i])
+        y.append(SYMPTOMS_DATA[i + 1])
+    
+    for text, label in extra_samples or []:
+        X.append(text)
+        y.append(label)
+    
+    return X, y
+
 class AdvancedMedicalAI:
-    def __init__(self):
+    def __init__(self, model_params=None, fallback_on_error=True):
+        # Per-member constructor overrides, e.g. {'random_forest': {'n_estimators': 300}}
+        self.model_params = model_params or {}
+        # Serve a placeholder prediction on failure; candidates raise instead
+        self.fallback_on_error = fallback_on_error
+        self.last_training_error = None
+        # Trained ensembles are saved here and loaded at startup instead of retraining
+        self.model_cache_path = None
         self.models = {}
         self.vectorizer = None
         self.is_trained = False
         self.model_performance = {}
+        self.model_version = 0
+        # Spelling normalization in front of the vectorizer, rebuilt with its vocabulary
+        self.spell_correction = True
+        self.spell_corrector = None
+        # Optional word list (one word per line) of valid words never rewritten
+        self.spelling_wordlist = None
+        # (vectorizer, models) pair read by the serving path; swapped as one unit
+        self._serving = (None, {})
+        self._train_lock = threading.Lock()
+        self._feature_names = (None, [])
+    
+    def ensure_trained(self):
+        """Load or train on first use; concurrent callers wait for a single run"""
+        if not self.is_trained or not self.vectorizer:
+            with self._train_lock:
+                if not self.is_trained or not self.vectorizer:
+                    if not self.load_models():
+                        self.train_ensemble_models()
         
-    def train_ensemble_models(self):
+    def train_ensemble_models(self, extra_samples=None):
         """Train multiple ML models for ensemble prediction"""
         try:
-            # Create synthetic medical training data
-            symptoms_data = [
-                "fever headache cough fatigue", "Common Cold",
-                "chest pain shortness of breath dizziness", "Heart Disease",
-                "fever cough fatigue body aches chills", "Influenza",
-                "persistent cough weight loss night sweats", "Tuberculosis",
-                "high blood pressure headache dizziness", "Hypertension",
-                "frequent urination excessive thirst weight loss", "Diabetes",
-                "severe headache nausea vomiting sensitivity light", "Migraine",
-                "joint pain swelling stiffness morning", "Arthritis",
-                "stomach pain nausea diarrhea vomiting", "Gastroenteritis",
-                "skin rash itching redness swelling", "Allergic Reaction",
-                "sore throat fever swollen glands", "Strep Throat",
-                "runny nose sneezing congestion", "Common Cold",
-                "chest tightness wheezing cough", "Asthma",
-                "back pain muscle aches stiffness", "Muscle Strain",
-                "bloating abdominal pain gas", "Digestive Issues"
-            ]
+            import numpy as np
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.model_selection import train_test_split
+            from sklearn.metrics import accuracy_score
             
             # Prepare training data
-            X = []
-            y = []
-            for i in range(0, len(symptoms_data), 2):
-                X.append(symptoms_data[i])
-                y.append(symptoms_data[i + 1])
+            X, y = load_training_data(extra_samples)
             
             # Create and train vectorizer
-            self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-            X_vectorized = self.vectorizer.fit_transform(X)
+            vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+            X_vectorized = vectorizer.fit_transform(X)
             
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(
@@ -58,81 +148,204 @@ class AdvancedMedicalAI:
             
             # Train multiple models
             models_config = {
-                'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
-                'gradient_boost': GradientBoostingClassifier(n_estimators=100, random_state=42),
-                'logistic_regression': LogisticRegression(random_state=42, max_iter=1000)
+                name: build_model(name, **self.model_params.get(name, {}))
+                for name in MODEL_DEFAULTS
             }
             
+            models = {}
+            performance = {}
             for name, model in models_config.items():
-                model.fit(X_train, y_train)
+                fit_model(name, model, X_train, y_train, np.unique(y))
                 y_pred = model.predict(X_test)
                 accuracy = accuracy_score(y_test, y_pred)
                 
-                self.models[name] = model
-                self.model_performance[name] = {
+                models[name] = model
+                performance[name] = {
                     'accuracy': round(accuracy * 100, 2),
                     'trained_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
             
-            self.models['saved_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            self.is_trained = True
+            models['saved_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.model_performance = performance
+            self.model_version += 1
+            if self.spell_correction:
+                # Installed before the vectorizer; unknown corrected words are simply ignored
+                self.spell_corrector = self._build_spell_corrector(vectorizer, X)
+            self._publish(vectorizer, models)
             
-            print(f"✓ Trained {len(models_config)} models successfully")
+            self.last_training_error = None
+            print(f"✓ Trained {len(models_config)} models successfully (version {self.model_version})")
             for name, perf in self.model_performance.items():
                 print(f"  - {name}: {perf['accuracy']}% accuracy")
+            if self.model_cache_path:
+                self.save_models()
+            return True
                 
         except Exception as e:
             print(f"Error training models: {e}")
-            self.is_trained = False
+            self.last_training_error = str(e)
+            # A failed retrain keeps serving the last published models
+            if self._serving[0] is None:
+                self.is_trained = False
+            return False
+    
+    def save_models(self, path=None):
+        """Persist the serving ensemble with joblib; returns False if it could not be written"""
+        import joblib
+        
+        path = path or self.model_cache_path
+        try:
+            vectorizer, models = self._serving
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump({
+                'fingerprint': training_fingerprint(self.model_params),
+                'vectorizer': vectorizer,
+                'models': models,
+                'model_performance': self.model_performance,
+                'model_version': self.model_version
+            }, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"⚠ Could not save models to {path}: {e}")
+            return False
+    
+    def load_models(self, path=None):
+        """Publish a saved ensemble if one matches the current training setup"""
+        path = path or self.model_cache_path
+        if not path or not os.path.exists(path):
+            return False
+        
+        try:
+            import joblib
+            saved = joblib.load(path)
+            if saved.get('fingerprint') != training_fingerprint(self.model_params):
+                print(f"⚠ Ignoring saved models in {path}: training setup has changed")
+                return False
+            self.model_performance = saved['model_performance']
+            self.model_version = saved['model_version']
+            # Rebuilt rather than saved so spelling settings always take effect
+            texts, _ = load_training_data()
+            self.spell_corrector = (self._build_spell_corrector(saved['vectorizer'], texts)
+                                    if self.spell_correction else None)
+            self._publish(saved['vectorizer'], saved['models'])
+            print(f"✓ Loaded saved models (version {self.model_version}) from {path}")
+            return True
+        except Exception as e:
+            print(f"⚠ Could not load saved models from {path}: {e}")
+            return False
+    
+    def _build_spell_corrector(self, vectorizer, texts):
+        from api.spelling import build_symptom_corrector, load_word_list
+        known_words = load_word_list(self.spelling_wordlist) if self.spelling_wordlist else ()
+        return build_symptom_corrector(vectorizer, texts, known_words=known_words)
+    
+    def _publish(self, vectorizer, models):
+        """Atomically swap the serving vectorizer and models"""
+        self.vectorizer = vectorizer
+        self.models = models
+        self._serving = (vectorizer, models)
+        self.is_trained = True
+    
+    def apply_online_update(self, updated_models):
+        """Publish incrementally updated copies of the online ensemble members"""
+        vectorizer, models = self._serving
+        models = dict(models)
+        models.update(updated_models)
+        self._publish(vectorizer, models)
+    
+    def _normalize_symptoms(self, symptoms_list):
+        """Spell-correct symptom texts; returns (texts, per-text corrections)"""
+        corrector = self.spell_corrector
+        if corrector is None:
+            return list(symptoms_list), [{} for _ in symptoms_list]
+        normalized = corrector.correct_batch(symptoms_list)
+        return [text for text, _ in normalized], [fixed for _, fixed in normalized]
+    
+    def vectorize_symptoms(self, symptoms_list):
+        """Return (TF-IDF rows, feature names, corrections) from the serving vectorizer"""
+        self.ensure_trained()
+        vectorizer, _ = self._serving
+        
+        cached_vectorizer, feature_names = self._feature_names
+        if cached_vectorizer is not vectorizer:
+            feature_names = vectorizer.get_feature_names_out().tolist()
+            self._feature_names = (vectorizer, feature_names)
+        
+        symptoms_list, corrections = self._normalize_symptoms(symptoms_list)
+        return vectorizer.transform(symptoms_list), feature_names, corrections
     
     def ensemble_predict(self, symptoms, age_group='Adult', severity_hint='Moderate'):
         """Make predictions using ensemble of models"""
-        if not self.is_trained or not self.vectorizer:
-            self.train_ensemble_models()
+        return self.ensemble_predict_batch([symptoms], age_group, severity_hint)[0]
+    
+    def ensemble_predict_batch(self, symptoms_list, age_group='Adult', severity_hint='Moderate'):
+        """Make ensemble predictions for many symptom texts with one pass per model"""
+        self.ensure_trained()
         
         try:
+            # Snapshot the serving state so background updates never mix versions
+            vectorizer, models = self._serving
+            
+            # Normalize misspellings the vectorizer would otherwise drop as out-of-vocabulary
+            with profile_stage('spelling'):
+                symptoms_list, corrections = self._normalize_symptoms(symptoms_list)
+            
             # Vectorize input
-            symptoms_vec = self.vectorizer.transform([symptoms])
+            with profile_stage('vectorization'):
+                symptoms_vec = vectorizer.transform(symptoms_list)
             
-            # Get predictions from all models
-            predictions = {}
-            confidences = {}
+            # Get predictions from all models; labels come from the argmax of
+            # predict_proba so each model only scores the batch once
+            model_labels = {}
+            model_confidences = {}
             
-            for name, model in self.models.items():
+            for name, model in models.items():
                 if name != 'saved_at':
-                    pred = model.predict(symptoms_vec)[0]
-                    pred_proba = model.predict_proba(symptoms_vec)[0]
-                    confidence = max(pred_proba) * 100
-                    
-                    predictions[name] = pred
-                    confidences[name] = round(confidence, 1)
+                    with profile_stage(f'model:{name}'):
+                        pred_proba = model.predict_proba(symptoms_vec)
+                        best = pred_proba.argmax(axis=1)
+                        model_labels[name] = model.classes_[best].tolist()
+                        model_confidences[name] = (pred_proba.max(axis=1) * 100).round(1).tolist()
             
-            # Ensemble prediction (majority vote)
-            pred_counts = {}
-            for pred in predictions.values():
-                pred_counts[pred] = pred_counts.get(pred, 0) + 1
-            
-            ensemble_prediction = max(pred_counts, key=pred_counts.get)
-            model_agreement = pred_counts[ensemble_prediction] / len(predictions) * 100
-            avg_confidence = sum(confidences.values()) / len(confidences)
+            results = []
+            for i in range(len(symptoms_list)):
+                predictions = {name: labels[i] for name, labels in model_labels.items()}
+                confidences = {name: values[i] for name, values in model_confidences.items()}
+                
+                # Ensemble prediction (majority vote)
+                pred_counts = {}
+                for pred in predictions.values():
+                    pred_counts[pred] = pred_counts.get(pred, 0) + 1
+                
+                ensemble_prediction = max(pred_counts, key=pred_counts.get)
+                model_agreement = pred_counts[ensemble_prediction] / len(predictions) * 100
+                avg_confidence = sum(confidences.values()) / len(confidences)
+                
+                results.append({
+                    'ensemble_prediction': ensemble_prediction,
+                    'confidence': round(avg_confidence, 1),
+                    'model_agreement': round(model_agreement, 1),
+                    'individual_predictions': predictions,
+                    'individual_confidences': confidences,
+                    'spelling_corrections': corrections[i]
+                })
             
-            return {
-                'ensemble_prediction': ensemble_prediction,
-                'confidence': round(avg_confidence, 1),
-                'model_agreement': round(model_agreement, 1),
-                'individual_predictions': predictions,
-                'individual_confidences': confidences
-            }
+            return results
             
         except Exception as e:
+            if not self.fallback_on_error:
+                raise
             print(f"Prediction error: {e}")
-            return {
+            return [{
                 'ensemble_prediction': 'Common Cold',
                 'confidence': 75.0,
                 'model_agreement': 100.0,
                 'individual_predictions': {'random_forest': 'Common Cold'},
-                'individual_confidences': {'random_forest': 75.0}
-            }
+                'individual_confidences': {'random_forest': 75.0},
+                'spelling_corrections': {}
+            } for _ in symptoms_list]
     
     def get_advanced_recommendations(self, disease, severity, age_group):
         """Get advanced treatment recommendations"""
@@ -0,0 +1,308 @@
+"""
+Similar-case retrieval over a sparse inverted index of TF-IDF vectors.
+
+Each term maps to a posting list of (case number, weight) pairs. A query only
+touches the postings of its own terms, accumulates dot products for those
+candidates and keeps the best k with a heap. Because the vectorizer rows are
+L2-normalized, the dot product is the cosine similarity.
+
+Postings live in two segments: an immutable base segment stored on disk as
+flat NumPy arrays (memory-mapped on load) and an in-memory delta segment of
+growable NumPy buffers that takes incremental inserts until the next save
+merges the two. Terms
+are stored as strings, so the index survives vectorizer retraining.
+
+On-disk layout of an index directory:
+    terms.json      {term: [offset, length]} into the posting arrays
+    doc_ids.npy     int64 case numbers, grouped by term
+    weights.npy     float32 TF-IDF weights aligned with doc_ids
+    cases.ndjson    one JSON case record per line
+    case_offsets.npy  int64 byte offsets of each line (n_cases + 1 entries)
+"""
+
+import heapq
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+class _BaseSegment:
+    """Immutable postings and case records, memory-mapped from an index directory"""
+
+    def __init__(self, path=None):
+        self.terms = {}
+        self.doc_ids = np.empty(0, dtype=np.int64)
+        self.weights = np.empty(0, dtype=np.float32)
+        self.case_offsets = np.zeros(1, dtype=np.int64)
+        self._cases_file = None
+        self._cases_map = None
+
+        if path is not None and os.path.exists(os.path.join(path, 'terms.json')):
+            with open(os.path.join(path, 'terms.json')) as f:
+                self.terms = json.load(f)
+            self.doc_ids = np.load(os.path.join(path, 'doc_ids.npy'), mmap_mode='r')
+            self.weights = np.load(os.path.join(path, 'weights.npy'), mmap_mode='r')
+            self.case_offsets = np.load(os.path.join(path, 'case_offsets.npy'), mmap_mode='r')
+            if len(self.case_offsets) > 1:
+                self._cases_file = open(os.path.join(path, 'cases.ndjson'), 'rb')
+                self._cases_map = mmap.mmap(self._cases_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.case_offsets) - 1
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self.doc_ids[offset:offset + length], self.weights[offset:offset + length]
+
+    def raw_case(self, number):
+        return self._cases_map[self.case_offsets[number]:self.case_offsets[number + 1]]
+
+class _PostingBuffer:
+    """Growable (doc_ids, weights) arrays; readers get views of the filled prefix"""
+
+    __slots__ = ('_state',)
+
+    def __init__(self, capacity=8):
+        # (ids, weights, length) replaced as one unit so readers see a consistent prefix
+        self._state = (np.empty(capacity, dtype=np.int64), np.empty(capacity, dtype=np.float32), 0)
+
+    def __len__(self):
+        return self._state[2]
+
+    def extend(self, ids, weights):
+        """Append postings; only called under the index write lock"""
+        buffer_ids, buffer_weights, length = self._state
+        end = length + len(ids)
+        if end > len(buffer_ids):
+            capacity = max(end, 2 * len(buffer_ids))
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_weights = np.empty(capacity, dtype=np.float32)
+            grown_ids[:length] = buffer_ids[:length]
+            grown_weights[:length] = buffer_weights[:length]
+            buffer_ids, buffer_weights = grown_ids, grown_weights
+        buffer_ids[length:end] = ids
+        buffer_weights[length:end] = weights
+        self._state = (buffer_ids, buffer_weights, end)
+
+    def arrays(self):
+        ids, weights, length = self._state
+        return ids[:length], weights[:length]
+
+class _DeltaSegment:
+    """Append-only in-memory postings for cases inserted since the last save"""
+
+    def __init__(self, start):
+        self.start = start
+        self.postings = {}
+        self.cases = []
+
+    def __len__(self):
+        return len(self.cases)
+
+class CaseIndex:
+    """Inverted index of historical cases for top-k cosine similarity search"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._write_lock = threading.Lock()
+        base = _BaseSegment(path)
+        # (base, delta) pair read by queries; swapped as one unit on save
+        self._segments = (base, _DeltaSegment(len(base)))
+
+    def __len__(self):
+        base, delta = self._segments
+        return len(base) + len(delta)
+
+    def add(self, records, X, feature_names):
+        """
+        Insert cases. `records` are JSON-serializable dicts and `X` holds their
+        TF-IDF rows from the vectorizer whose terms are `feature_names`.
+        Returns the assigned case numbers.
+        """
+        X = X.tocsr()
+        with self._write_lock:
+            _, delta = self._segments
+            first = delta.start + len(delta.cases)
+            numbers = list(range(first, first + len(records)))
+
+            # Group the batch's postings by term so each buffer grows once
+            batch_postings = {}
+            for i, number in enumerate(numbers):
+                row = slice(X.indptr[i], X.indptr[i + 1])
+                for term_index, weight in zip(X.indices[row], X.data[row]):
+                    ids, weights = batch_postings.setdefault(feature_names[term_index], ([], []))
+                    ids.append(number)
+                    weights.append(weight)
+            for term, (ids, weights) in batch_postings.items():
+                buffer = delta.postings.get(term)
+                if buffer is None:
+                    buffer = delta.postings[term] = _PostingBuffer()
+                buffer.extend(ids, weights)
+
+            # Publish the records last so queries never see postings without them
+            delta.cases.extend(records)
+        return numbers
+
+    def get_case(self, number):
+        base, delta = self._segments
+        if number < len(base):
+            return json.loads(base.raw_case(number))
+        return delta.cases[number - delta.start]
+
+    def query(self, x, feature_names, k=10):
+        """
+        Return up to k (score, case_number) pairs most similar to the single
+        TF-IDF row `x`, plus the number of candidate postings scored
+        """
+        if k < 1:
+            raise ValueError('k must be at least 1')
+
+        base, delta = self._segments
+        x = x.tocsr()
+        n_cases = delta.start + len(delta.cases)
+
+        id_parts = []
+        score_parts = []
+        for term_index, query_weight in zip(x.indices, x.data):
+            term = feature_names[term_index]
+            postings = base.postings(term)
+            if postings is not None:
+                id_parts.append(postings[0])
+                score_parts.append(postings[1] * query_weight)
+            buffer = delta.postings.get(term)
+            if buffer is not None:
+                ids, weights = buffer.arrays()
+                id_parts.append(ids)
+                score_parts.append(weights * query_weight)
+
+        if not id_parts:
+            return [], 0
+
+        ids = np.concatenate(id_parts)
+        partial_scores = np.concatenate(score_parts).astype(np.float64)
+        # Ignore postings whose case record is not yet published
+        visible = ids < n_cases
+        ids, partial_scores = ids[visible], partial_scores[visible]
+
+        # Sum per-term contributions for every candidate that shares a term.
+        # Sorting the candidates is cheaper for selective queries; once they
+        # cover a sizeable share of the index a flat accumulator wins.
+        if len(ids) * 8 < n_cases:
+            candidates, inverse = np.unique(ids, return_inverse=True)
+            scores = np.bincount(inverse, weights=partial_scores)
+        else:
+            scores = np.bincount(ids, weights=partial_scores, minlength=n_cases)
+            candidates = np.flatnonzero(scores)
+            scores = scores[candidates]
+
+        # Cheap pre-filter so the heap only sees plausible top-k candidates
+        if len(scores) > 4 * k:
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores >= threshold
+            candidates, scores = candidates[keep], scores[keep]
+
+        top = heapq.nlargest(k, zip(scores.tolist(), candidates.tolist()))
+        return top, len(ids)
+
+    def save(self, path=None):
+        """Merge the delta into a new on-disk base segment and memory-map it"""
+        path = path or self.path
+        if path is None:
+            raise ValueError('No index path configured')
+
+        with self._write_lock:
+            base, delta = self._segments
+            tmp_path = f"{path}.tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+
+            terms = {}
+            id_parts = []
+            weight_parts = []
+            offset = 0
+            for term in sorted(set(base.terms) | set(delta.postings)):
+                length = 0
+                postings = base.postings(term)
+                if postings is not None:
+                    id_parts.append(np.asarray(postings[0]))
+                    weight_parts.append(np.asarray(postings[1]))
+                    length += len(postings[0])
+                if term in delta.postings:
+                    ids, weights = delta.postings[term].arrays()
+                    id_parts.append(ids)
+                    weight_parts.append(weights)
+                    length += len(ids)
+                terms[term] = [offset, length]
+                offset += length
+
+            doc_ids = np.concatenate(id_parts) if id_parts else np.empty(0, dtype=np.int64)
+            weights = np.concatenate(weight_parts) if weight_parts else np.empty(0, dtype=np.float32)
+            np.save(os.path.join(tmp_path, 'doc_ids.npy'), doc_ids.astype(np.int64))
+            np.save(os.path.join(tmp_path, 'weights.npy'), weights.astype(np.float32))
+            with open(os.path.join(tmp_path, 'terms.json'), 'w') as f:
+                json.dump(terms, f)
+
+            offsets = [0]
+            with open(os.path.join(tmp_path, 'cases.ndjson'), 'wb') as f:
+                for number in range(len(base)):
+                    line = bytes(base.raw_case(number))
+                    f.write(line)
+                    offsets.append(offsets[-1] + len(line))
+                for record in delta.cases:
+                    line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+                    f.write(line)
+                    offsets.append(offsets[-1] + len(line))
+            np.save(os.path.join(tmp_path, 'case_offsets.npy'), np.array(offsets, dtype=np.int64))
+
+            # Swap directories, then serve from the freshly mapped segment
+            if os.path.exists(path):
+                old_path = f"{path}.old"
+                shutil.rmtree(old_path, ignore_errors=True)
+                os.replace(path, old_path)
+                os.replace(tmp_path, path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.replace(tmp_path, path)
+
+            new_base = _BaseSegment(path)
+            self._segments = (new_base, _DeltaSegment(len(new_base)))
+            self.path = path
+        # In-flight queries may still hold the old mapping, so it is left for GC to close
+        return len(new_base)
+
+    def get_stats(self):
+        base, delta = self._segments
+        return {
+            'cases': len(base) + len(delta),
+            'on_disk_cases': len(base),
+            'in_memory_cases': len(delta),
+            'terms': len(set(base.terms) | set(delta.postings)),
+            'postings': int(len(base.doc_ids) + sum(len(buffer) for buffer in list(delta.postings.values())))
+        }
+
+def search_similar_cases(index, ai, symptoms, k=10):
+    """Vectorize symptoms with the live model and return the k most similar cases"""
+    start = time.perf_counter()
+    X, feature_names, _ = ai.vectorize_symptoms([symptoms])
+    top, candidates = index.query(X[0], feature_names, k)
+
+    cases = []
+    for score, number in top:
+        case = dict(index.get_case(number))
+        # Stable handle for cases added without their own case_id
+        case['case_number'] = number
+        case['similarity'] = round(score, 4)
+        cases.append(case)
+
+    return {
+        'cases': cases,
+        'candidates_scored': candidates,
+        'query_ms': round((time.perf_counter() - start) * 1000, 3)
+    }
@@ -0,0 +1,254 @@
+"""
+Parallel cross-validated evaluation of the ensemble members.
+
+Stratified k-fold splits are vectorized once, cached on disk and shared with
+every worker process, so each (model, hyperparameters, fold) task only pays
+for fitting and scoring. Results are written as JSON with per-fold metrics
+and timings, which /api/model-performance serves alongside the live models.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from api.advanced_ml import MODEL_DEFAULTS, VECTORIZER_PARAMS, build_model, fit_model
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS_PATH = os.path.join(BACKEND_DIR, 'evaluation_results.json')
+DEFAULT_CACHE_DIR = os.path.join(BACKEND_DIR, '.eval_cache')
+
+# Hyperparameter grids searched for each ensemble member
+DEFAULT_PARAM_GRIDS = {
+    'random_forest': {'n_estimators': [100, 300], 'max_depth': [None, 20]},
+    'gradient_boost': {'n_estimators': [100], 'learning_rate': [0.05, 0.1]},
+    'logistic_regression': {'C': [0.1, 1.0, 10.0]},
+    'naive_bayes': {'alpha': [0.01, 0.1, 1.0]},
+    'sgd_classifier': {'alpha': [1e-5, 1e-4, 1e-3]}
+}
+
+# Column/field names accepted for the label in --data files
+LABEL_FIELDS = ('label', 'disease', 'diagnosis')
+
+# Folds loaded once per worker process by _init_worker
+_worker_folds = None
+
+def _cache_key(texts, labels, n_splits, random_state):
+    digest = hashlib.sha1()
+    for text, label in zip(texts, labels):
+        digest.update(f"{text}\t{label}\n".encode('utf-8'))
+    digest.update(json.dumps([n_splits, random_state, VECTORIZER_PARAMS], sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def build_folds(texts, labels, n_splits=5, random_state=42, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Vectorize stratified k-fold splits once and cache them on disk.
+
+    Each fold's vectorizer is fit on its training part only, so there is no
+    leakage from the held-out part. Returns the path of the cache file.
+    """
+    import joblib
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.model_selection import StratifiedKFold
+
+    path = os.path.join(cache_dir, f"folds-{_cache_key(texts, labels, n_splits, random_state)}.joblib")
+    if os.path.exists(path):
+        return path
+
+    texts = np.asarray(texts, dtype=object)
+    labels = np.asarray(labels)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+
+    folds = []
+    for train_idx, test_idx in splitter.split(texts, labels):
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        folds.append({
+            'X_train': vectorizer.fit_transform(texts[train_idx]),
+            'y_train': labels[train_idx],
+            'X_test': vectorizer.transform(texts[test_idx]),
+            'y_test': labels[test_idx]
+        })
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump({'folds': folds, 'classes': np.unique(labels)}, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def load_labelled_samples(path):
+    """
+    Read (symptoms, label) pairs from a CSV file with a header row, a JSON
+    list of objects or an NDJSON file. Each record needs a `symptoms` field
+    and one of LABEL_FIELDS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension == '.csv':
+            records = list(csv.DictReader(f))
+        elif extension == '.json':
+            records = json.load(f)
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    samples = []
+    for number, record in enumerate(records, 1):
+        label_field = next((field for field in LABEL_FIELDS if record.get(field)), None)
+        if not record.get('symptoms') or label_field is None:
+            raise ValueError(f"{path}: record {number} needs 'symptoms' and one of {', '.join(LABEL_FIELDS)}")
+        samples.append((str(record['symptoms']), str(record[label_field])))
+    return samples
+
+def _init_worker(folds_path):
+    """Memory-map the cached folds once per worker process"""
+    global _worker_folds
+    import joblib
+    _worker_folds = joblib.load(folds_path, mmap_mode='r')
+
+def _evaluate_candidate_fold(task):
+    """Fit one (model, params) candidate on one fold and score it"""
+    from sklearn.metrics import accuracy_score, f1_score
+
+    name, params, fold_index = task
+    fold = _worker_folds['folds'][fold_index]
+
+    start = time.perf_counter()
+    model = fit_model(name, build_model(name, **params), fold['X_train'], fold['y_train'],
+                      _worker_folds['classes'])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(fold['X_test'])
+    predict_seconds = time.perf_counter() - start
+
+    return name, params, {
+        'fold': fold_index,
+        'accuracy': round(float(accuracy_score(fold['y_test'], y_pred)) * 100, 2),
+        'f1_macro': round(float(f1_score(fold['y_test'], y_pred, average='macro', zero_division=0)) * 100, 2),
+        'fit_seconds': round(fit_seconds, 4),
+        'predict_seconds': round(predict_seconds, 4),
+        'test_size': int(len(fold['y_test']))
+    }
+
+def _summarize(name, params, folds):
+    folds = sorted(folds, key=lambda fold: fold['fold'])
+    accuracies = [fold['accuracy'] for fold in folds]
+    mean_accuracy = sum(accuracies) / len(accuracies)
+    variance = sum((acc - mean_accuracy) ** 2 for acc in accuracies) / len(accuracies)
+    return {
+        'model': name,
+        'params': params,
+        'mean_accuracy': round(mean_accuracy, 2),
+        'std_accuracy': round(variance ** 0.5, 2),
+        'mean_f1_macro': round(sum(fold['f1_macro'] for fold in folds) / len(folds), 2),
+        'mean_fit_seconds': round(sum(fold['fit_seconds'] for fold in folds) / len(folds), 4),
+        'folds': folds
+    }
+
+def run_evaluation(samples, n_splits=5, param_grids=None, workers=None, results_path=DEFAULT_RESULTS_PATH,
+                   cache_dir=DEFAULT_CACHE_DIR, random_state=42):
+    """
+    Cross-validate every candidate of every ensemble member on labelled
+    (symptoms, label) `samples` in a process pool.
+
+    The built-in training data has a single example for most conditions, so
+    it cannot be cross-validated. Raises ValueError, without writing results,
+    when any class has fewer than n_splits samples.
+    """
+    from collections import Counter
+    from sklearn.model_selection import ParameterGrid
+
+    if param_grids is None:
+        param_grids = DEFAULT_PARAM_GRIDS
+    if n_splits < 2:
+        raise ValueError('At least 2 folds are required')
+
+    texts = [text for text, _ in samples]
+    labels = [label for _, label in samples]
+    if not texts:
+        raise ValueError('No labelled samples to evaluate')
+
+    # Every fold must hold out at least one sample of every class
+    class_counts = Counter(labels)
+    too_small = sorted(label for label, count in class_counts.items() if count < n_splits)
+    if too_small:
+        raise ValueError(
+            f"{len(too_small)} of {len(class_counts)} classes have fewer than {n_splits} samples "
+            f"(smallest: {min(class_counts.values())}), e.g. {', '.join(too_small[:5])}; "
+            f"provide more labelled data or lower --folds"
+        )
+
+    wall_start = time.perf_counter()
+    folds_path = build_folds(texts, labels, n_splits, random_state, cache_dir)
+    vectorize_seconds = time.perf_counter() - wall_start
+
+    tasks = []
+    for name in MODEL_DEFAULTS:
+        for params in ParameterGrid(param_grids.get(name, {})):
+            for fold_index in range(n_splits):
+                tasks.append((name, params, fold_index))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(folds_path,)) as executor:
+        for name, params, fold_metrics in executor.map(_evaluate_candidate_fold, tasks, chunksize=4):
+            key = (name, json.dumps(params, sort_keys=True))
+            results.setdefault(key, (name, params, []))[2].append(fold_metrics)
+
+    candidates = [_summarize(name, params, folds) for name, params, folds in results.values()]
+    best = {}
+    for candidate in candidates:
+        current = best.get(candidate['model'])
+        if current is None or candidate['mean_accuracy'] > current['mean_accuracy']:
+            best[candidate['model']] = candidate
+
+    report = {
+        'evaluated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'n_splits': n_splits,
+        'n_samples': len(texts),
+        'n_classes': len(set(labels)),
+        'n_tasks': len(tasks),
+        'workers': workers or os.cpu_count(),
+        'vectorize_seconds': round(vectorize_seconds, 4),
+        'wall_seconds': round(time.perf_counter() - wall_start, 4),
+        'best': {name: {key: value for key, value in candidate.items() if key != 'folds'}
+                 for name, candidate in best.items()},
+        'candidates': candidates
+    }
+
+    tmp_path = f"{results_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, results_path)
+
+    print(f"✓ Evaluated {len(candidates)} candidates over {n_splits} folds "
+          f"in {report['wall_seconds']:.1f}s")
+    for name, candidate in report['best'].items():
+        print(f"  - {name}: {candidate['mean_accuracy']}% ± {candidate['std_accuracy']} {candidate['params']}")
+    return report
+
+def load_evaluation_summary(results_path=DEFAULT_RESULTS_PATH):
+    """Return per-model cross-validation metrics of the best candidate, or {} if not evaluated"""
+    try:
+        with open(results_path) as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    summary = {}
+    for name, candidate in report.get('best', {}).items():
+        folds = next((c['folds'] for c in report.get('candidates', [])
+                      if c['model'] == name and c['params'] == candidate['params']), [])
+        summary[name] = {
+            'cv_accuracy': candidate['mean_accuracy'],
+            'cv_accuracy_std': candidate['std_accuracy'],
+            'cv_f1_macro': candidate['mean_f1_macro'],
+            'best_params': candidate['params'],
+            'n_splits': report.get('n_splits'),
+            'evaluated_at': report.get('evaluated_at'),
+            'folds': folds
+        }
+    return summary
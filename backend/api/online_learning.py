@@ -0,0 +1,189 @@
+import copy
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from api.advanced_ml import ONLINE_MODELS
+
+class FeedbackLearner:
+    """
+    Buffer clinician feedback and apply it to an AdvancedMedicalAI instance
+    in the background.
+
+    Confirmed or corrected labels are applied to the partial_fit-capable
+    ensemble members in small batches. Every `compaction_every` samples the
+    full ensemble is retrained on the base data plus all feedback seen so far
+    and published as a new model version. Request threads only ever enqueue.
+    """
+
+    def __init__(self, ai, queue_size=10000, batch_size=32, flush_interval=1.0,
+                 compaction_every=500, history_size=100000):
+        self.ai = ai
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compaction_every = compaction_every
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._history = deque(maxlen=history_size)
+        self._since_compaction = 0
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self._stats = {
+            'received': 0,
+            'dropped': 0,
+            'applied': 0,
+            'skipped_unknown_label': 0,
+            'rejected_invalid': 0,
+            'batches': 0,
+            'compactions': 0,
+            'last_batch_ms': 0.0,
+            'last_compaction_ms': 0.0,
+            'last_compaction_at': None,
+            'errors': 0
+        }
+
+    def submit(self, symptoms, label):
+        """Queue a feedback sample without blocking; returns False if dropped"""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((symptoms, label, time.perf_counter()))
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['dropped'] += 1
+            return False
+
+        with self._stats_lock:
+            self._stats['received'] += 1
+        return True
+
+    def _ensure_worker(self):
+        """Start the background worker on first use"""
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name='feedback-learner', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._apply_batch(batch)
+                if self._since_compaction >= self.compaction_every:
+                    self.compact()
+            except Exception as e:
+                print(f"Feedback update error: {e}")
+                with self._stats_lock:
+                    self._stats['errors'] += 1
+
+    def _apply_batch(self, batch):
+        """Incrementally update copies of the online models, then publish them"""
+        import numpy as np
+
+        start = time.perf_counter()
+
+        # Drop malformed samples one by one so they can't sink the whole batch
+        valid = [sample for sample in batch if self._is_valid_sample(sample)]
+        rejected = len(batch) - len(valid)
+        if rejected:
+            with self._stats_lock:
+                self._stats['rejected_invalid'] += rejected
+            batch = valid
+        if not batch:
+            return
+
+        self.ai.ensure_trained()
+
+        vectorizer, models = self.ai._serving
+        texts = [text for text, _, _ in batch]
+        corrector = self.ai.spell_corrector
+        if corrector is not None:
+            # Learn from the same normalized text the serving path vectorizes
+            texts = [normalized for normalized, _ in corrector.correct_batch(texts)]
+        labels = np.array([label for _, label, _ in batch])
+        self._history.extend(zip(texts, labels.tolist()))
+        self._since_compaction += len(batch)
+
+        X = vectorizer.transform(texts)
+        updated = {}
+        skipped = 0
+        for name in ONLINE_MODELS:
+            model = models.get(name)
+            if model is None:
+                continue
+            # Labels the model has never seen wait for the next compaction
+            known = np.isin(labels, model.classes_)
+            skipped = max(skipped, int((~known).sum()))
+            if not known.any():
+                continue
+            # Copy-on-write so in-flight predictions keep a consistent model
+            model = copy.deepcopy(model)
+            model.partial_fit(X[known], labels[known])
+            updated[name] = model
+
+        if updated:
+            self.ai.apply_online_update(updated)
+
+        done = time.perf_counter()
+        with self._stats_lock:
+            self._stats['applied'] += len(batch) - skipped
+            self._stats['skipped_unknown_label'] += skipped
+            self._stats['batches'] += 1
+            self._stats['last_batch_ms'] = round((done - start) * 1000, 2)
+            self._latencies.extend((done - enqueued) * 1000 for _, _, enqueued in batch)
+
+    @staticmethod
+    def _is_valid_sample(sample):
+        symptoms, label, _ = sample
+        return (isinstance(symptoms, str) and symptoms.strip() != ''
+                and isinstance(label, str) and label.strip() != '')
+
+    def compact(self):
+        """Retrain the full ensemble on base data plus feedback as a new version"""
+        start = time.perf_counter()
+        # Reset first so a failing retrain is retried after the next interval, not every batch
+        self._since_compaction = 0
+        if not self.ai.train_ensemble_models(extra_samples=list(self._history)):
+            raise RuntimeError('Compaction failed; still serving the previous model version')
+
+        with self._stats_lock:
+            self._stats['compactions'] += 1
+            self._stats['last_compaction_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            self._stats['last_compaction_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def get_stats(self):
+        """Report feedback backlog and update latency"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            latencies = sorted(self._latencies)
+
+        if latencies:
+            stats['update_latency_ms'] = {
+                'mean': round(sum(latencies) / len(latencies), 2),
+                'p50': round(latencies[len(latencies) // 2], 2),
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+                'max': round(latencies[-1], 2)
+            }
+        else:
+            stats['update_latency_ms'] = {}
+
+        stats['backlog'] = self._queue.qsize()
+        stats['pending_compaction'] = self._since_compaction
+        stats['model_version'] = self.ai.model_version
+        return stats
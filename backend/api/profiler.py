@@ -0,0 +1,266 @@
+"""
+On-demand statistical profiler for live requests.
+
+When enabled, a sampled fraction of requests (or any request carrying the
+`X-Profile: 1` header, if allowed) registers its thread for profiling. A
+single background thread wakes every `interval_ms`, snapshots the stacks of
+just those threads with sys._current_frames() and aggregates them as
+collapsed stacks ("frame;frame;frame count"), the input format of
+flamegraph.pl and speedscope.
+
+Code can mark logical stages with `profile_stage(name)`; active stages are
+added to each sample as pseudo-frames (e.g. "stage:model:random_forest"),
+so time is attributed to vectorization, each ensemble member and the
+recommendation/risk steps even when the Python frames look alike. When no
+request is being profiled, `profile_stage` returns a shared no-op context.
+"""
+
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+_NULL_STAGE = contextlib.nullcontext()
+
+# Accepted sampling intervals; shorter ones turn the sampler into a busy loop
+MIN_INTERVAL_MS = 1.0
+MAX_INTERVAL_MS = 1000.0
+
+# Thread id -> [request label, stage, stage, ...] for threads being profiled
+_profiled_threads = {}
+
+class _Stage:
+    __slots__ = ('name', 'stack')
+
+    def __init__(self, name):
+        self.name = name
+        self.stack = None
+
+    def __enter__(self):
+        self.stack = _profiled_threads.get(threading.get_ident())
+        if self.stack is not None:
+            self.stack.append(f'stage:{self.name}')
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.stack is not None:
+            self.stack.pop()
+        return False
+
+def profile_stage(name):
+    """Mark a logical stage for the profiler; free when nothing is profiled"""
+    if not _profiled_threads:
+        return _NULL_STAGE
+    return _Stage(name)
+
+class SamplingProfiler:
+    """Low-overhead stack sampler for selected request threads"""
+
+    def __init__(self, interval_ms=5.0, sample_rate=0.0, max_depth=64):
+        self.enabled = False
+        self.interval_ms = interval_ms
+        self.sample_rate = sample_rate
+        self.max_depth = max_depth
+        self._stacks = Counter()
+        # Inclusive wall time per stage, accumulated from the measured gap before each sample
+        self._stage_ms = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._samples = 0
+        self._profiled_requests = 0
+        self._sampler_seconds = 0.0
+        self._started_at = None
+
+    def configure(self, enabled=None, sample_rate=None, interval_ms=None):
+        if interval_ms is not None and not MIN_INTERVAL_MS <= interval_ms <= MAX_INTERVAL_MS:
+            raise ValueError(f"interval_ms must be between {MIN_INTERVAL_MS:g} and {MAX_INTERVAL_MS:g}")
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+            if interval_ms is not None:
+                self.interval_ms = interval_ms
+            if enabled is not None:
+                self.enabled = enabled
+                if enabled and self._started_at is None:
+                    self._started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if self.enabled and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+
+    def should_profile(self, forced=False):
+        return self.enabled and (forced or random.random() < self.sample_rate)
+
+    def begin(self, label):
+        """Start profiling the current thread; returns its id for end()"""
+        thread_id = threading.get_ident()
+        _profiled_threads[thread_id] = [label]
+        with self._lock:
+            self._profiled_requests += 1
+        return thread_id
+
+    def end(self, thread_id=None):
+        _profiled_threads.pop(threading.get_ident() if thread_id is None else thread_id, None)
+
+    def _run(self):
+        last_wake = time.perf_counter()
+        while self.enabled:
+            time.sleep(self.interval_ms / 1000)
+            start = time.perf_counter()
+            elapsed_ms = (start - last_wake) * 1000
+            last_wake = start
+            if not _profiled_threads:
+                continue
+            frames = sys._current_frames()
+            collected = []
+            stages = Counter()
+            for thread_id, stage_stack in list(_profiled_threads.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stage_stack = list(stage_stack)
+                    collected.append(';'.join(stage_stack + self._frame_names(frame)))
+                    # Each sample stands for the time since the previous one
+                    for stage in set(stage_stack[1:]):
+                        stages[stage[len('stage:'):]] += elapsed_ms
+            with self._lock:
+                self._stacks.update(collected)
+                self._stage_ms.update(stages)
+                self._samples += len(collected)
+                self._sampler_seconds += time.perf_counter() - start
+
+    def _frame_names(self, frame):
+        """Python frames root-first, starting below Flask's request dispatch"""
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            if code.co_name == 'dispatch_request':
+                break
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return names
+
+    def collapsed(self):
+        """Aggregated stacks in collapsed ("a;b;c count") format"""
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def export(self, output_dir):
+        """Write the collapsed stacks to a timestamped .folded file and return its path"""
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded")
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._stage_ms.clear()
+            self._samples = 0
+            self._profiled_requests = 0
+            self._sampler_seconds = 0.0
+            self._started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if self.enabled else None
+
+    def get_stats(self, top=20):
+        """Sample counts, sampler overhead and estimated time per stage"""
+        with self._lock:
+            stats = {
+                'enabled': self.enabled,
+                'sample_rate': self.sample_rate,
+                'interval_ms': self.interval_ms,
+                'started_at': self._started_at,
+                'profiled_requests': self._profiled_requests,
+                'samples': self._samples,
+                'sampler_ms': round(self._sampler_seconds * 1000, 2),
+                'active_threads': len(_profiled_threads),
+                # Inclusive: a sample counts once for every stage on its stack
+                'stages_ms': {stage: round(ms, 1) for stage, ms in self._stage_ms.most_common(top)}
+            }
+        return stats
+
+# Process-wide profiler (singleton pattern)
+profiler = SamplingProfiler()
+
+def init_profiler(app):
+    """Register request hooks and admin endpoints for the sampling profiler"""
+    # Imported here so model code can use profile_stage without Flask
+    from flask import g, jsonify, request, Response
+
+    config = app.config
+    profiler.configure(
+        enabled=config.get('PROFILER_ENABLED', False),
+        sample_rate=config.get('PROFILER_SAMPLE_RATE', 0.0),
+        interval_ms=config.get('PROFILER_INTERVAL_MS', 5.0)
+    )
+    output_dir = config.get('PROFILER_OUTPUT_DIR', 'profiles')
+    allow_header = config.get('PROFILER_ALLOW_HEADER', False)
+
+    @app.before_request
+    def start_profiling():
+        if request.path.startswith('/api/profiler'):
+            return None
+        forced = allow_header and request.headers.get('X-Profile') == '1'
+        if profiler.should_profile(forced):
+            g.profiled_thread = profiler.begin(f"{request.method} {request.path}")
+        return None
+
+    @app.after_request
+    def stop_profiling_on_close(response):
+        # Streamed bodies run after teardown; keep sampling until the response closes
+        thread_id = g.pop('profiled_thread', None)
+        if thread_id is not None:
+            response.call_on_close(lambda: profiler.end(thread_id))
+        return response
+
+    @app.teardown_request
+    def stop_profiling(exc=None):
+        # Fallback for requests that ended without a response reaching after_request
+        thread_id = g.pop('profiled_thread', None)
+        if thread_id is not None:
+            profiler.end(thread_id)
+
+    @app.route('/api/profiler', methods=['GET', 'POST', 'DELETE'])
+    def profiler_control():
+        try:
+            if request.method == 'POST':
+                data = request.get_json(silent=True) or {}
+                enabled = data.get('enabled')
+                if enabled is not None and not isinstance(enabled, bool):
+                    return jsonify({'error': 'enabled must be true or false'}), 400
+                try:
+                    sample_rate = float(data['sample_rate']) if data.get('sample_rate') is not None else None
+                    interval_ms = float(data['interval_ms']) if data.get('interval_ms') is not None else None
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'sample_rate and interval_ms must be numbers'}), 400
+                if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+                    return jsonify({'error': 'sample_rate must be between 0 and 1'}), 400
+                if interval_ms is not None and not MIN_INTERVAL_MS <= interval_ms <= MAX_INTERVAL_MS:
+                    return jsonify({
+                        'error': f"interval_ms must be between {MIN_INTERVAL_MS:g} and {MAX_INTERVAL_MS:g}"
+                    }), 400
+                profiler.configure(enabled=enabled, sample_rate=sample_rate, interval_ms=interval_ms)
+            elif request.method == 'DELETE':
+                profiler.reset()
+            return jsonify(profiler.get_stats())
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/profiler/collapsed', methods=['GET'])
+    def profiler_collapsed():
+        return Response(profiler.collapsed(), mimetype='text/plain')
+
+    @app.route('/api/profiler/export', methods=['POST'])
+    def profiler_export():
+        try:
+            return jsonify({'path': profiler.export(output_dir), 'stats': profiler.get_stats()})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return profiler
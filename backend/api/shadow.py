@@ -0,0 +1,153 @@
+"""
+Shadow evaluation of candidate models on live traffic.
+
+A sampled fraction of /api/advanced-predict inputs, together with the live
+ensemble's answer, is pushed onto a bounded queue without blocking. A small
+pool of background threads drains it in batches, runs every registered
+candidate and aggregates agreement with the live label, confidence deltas
+and candidate latency. When the queue is full the sample is dropped.
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+class _CandidateStats:
+    def __init__(self):
+        self.samples = 0
+        self.agreements = 0
+        self.confidence_delta_sum = 0.0
+        self.abs_confidence_delta_sum = 0.0
+        self.batches = 0
+        self.errors = 0
+        self.record_latency_ms = deque(maxlen=1000)
+
+    def as_dict(self):
+        latencies = sorted(self.record_latency_ms)
+        samples = self.samples or 1
+        return {
+            'samples': self.samples,
+            'agreement_rate': round(self.agreements / samples * 100, 2),
+            'mean_confidence_delta': round(self.confidence_delta_sum / samples, 2),
+            'mean_abs_confidence_delta': round(self.abs_confidence_delta_sum / samples, 2),
+            'batches': self.batches,
+            'errors': self.errors,
+            'latency_ms_per_record': {
+                'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3) if latencies else 0.0
+            }
+        }
+
+class ShadowEvaluator:
+    """Compare candidate models against the live ensemble off the request path"""
+
+    def __init__(self, sample_rate=0.0, queue_size=1000, batch_size=32, workers=2, flush_interval=0.5):
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.workers = workers
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        # name -> model exposing ensemble_predict_batch; replaced as a whole
+        self._candidates = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._sampled = 0
+        self._dropped = 0
+
+    def register_candidate(self, name, model):
+        """Add or replace a candidate model; its statistics start from zero"""
+        with self._lock:
+            candidates = dict(self._candidates)
+            candidates[name] = model
+            self._candidates = candidates
+            self._stats[name] = _CandidateStats()
+        self._ensure_workers()
+
+    def remove_candidate(self, name):
+        with self._lock:
+            candidates = dict(self._candidates)
+            candidates.pop(name, None)
+            self._candidates = candidates
+
+    def maybe_submit(self, symptoms, live_result):
+        """Sample a live prediction for shadowing; never blocks the caller"""
+        if not self._candidates or random.random() >= self.sample_rate:
+            return False
+        try:
+            self._queue.put_nowait((symptoms, live_result['ensemble_prediction'], live_result['confidence']))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._sampled += 1
+        return True
+
+    def _ensure_workers(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f'shadow-worker-{len(self._threads)}',
+                                          daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._evaluate_batch(batch)
+
+    def _evaluate_batch(self, batch):
+        texts = [text for text, _, _ in batch]
+        for name, model in self._candidates.items():
+            stats = self._stats[name]
+            try:
+                # Train lazily registered candidates outside the timed section
+                if hasattr(model, 'ensure_trained'):
+                    model.ensure_trained()
+                    if not model.is_trained:
+                        raise RuntimeError(f"candidate is not trained: {model.last_training_error}")
+                start = time.perf_counter()
+                results = model.ensemble_predict_batch(texts)
+                per_record_ms = (time.perf_counter() - start) * 1000 / len(batch)
+            except Exception as e:
+                print(f"Shadow evaluation error ({name}): {e}")
+                with self._lock:
+                    stats.errors += 1
+                continue
+
+            with self._lock:
+                stats.batches += 1
+                stats.record_latency_ms.append(per_record_ms)
+                for (_, live_label, live_confidence), result in zip(batch, results):
+                    delta = result['confidence'] - live_confidence
+                    stats.samples += 1
+                    stats.agreements += int(result['ensemble_prediction'] == live_label)
+                    stats.confidence_delta_sum += delta
+                    stats.abs_confidence_delta_sum += abs(delta)
+
+    def get_stats(self):
+        """Per-candidate agreement, confidence deltas and latency"""
+        with self._lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'sampled': self._sampled,
+                'dropped': self._dropped,
+                'backlog': self._queue.qsize(),
+                'candidates': {name: self._stats[name].as_dict() for name in self._candidates}
+            }
+
+def params_from_evaluation(summary):
+    """Turn a load_evaluation_summary() result into AdvancedMedicalAI model_params"""
+    return {name: metrics['best_params'] for name, metrics in summary.items()}
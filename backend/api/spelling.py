@@ -0,0 +1,193 @@
+"""
+Fast symptom spelling normalization using a symmetric-deletion index.
+
+Every dictionary word is indexed under all strings obtained by deleting up to
+`max_edit_distance` characters from it. A misspelt token generates its own
+deletes and looks them up, so candidate retrieval is a handful of hash
+lookups per token instead of an edit-distance scan over the vocabulary.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+def _deletes(word, max_distance, prefix_length):
+    """All strings reachable from word's prefix by deleting up to max_distance characters"""
+    word = word[:prefix_length]
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for candidate in frontier:
+            if len(candidate) <= 1:
+                continue
+            for i in range(len(candidate)):
+                next_frontier.add(candidate[:i] + candidate[i + 1:])
+        next_frontier -= results
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment (Damerau-Levenshtein) distance, or max_distance + 1 if larger"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+class SymSpellCorrector:
+    """Correct misspelt tokens against a fixed dictionary of known words"""
+
+    def __init__(self, word_counts, max_edit_distance=1, prefix_length=7, min_token_length=4,
+                 cache_size=100000, known_words=()):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.min_token_length = min_token_length
+        self.word_counts = dict(word_counts)
+        # Words left as they are but never offered as corrections (e.g. stop words)
+        self.known_words = frozenset(known_words)
+        self.cache_size = cache_size
+        self._cache = {}
+        self._stats_lock = threading.Lock()
+        self._tokens = 0
+        self._corrected = 0
+        self._seconds = 0.0
+
+        self._index = {}
+        for word in self.word_counts:
+            for deleted in _deletes(word, max_edit_distance, prefix_length):
+                self._index.setdefault(deleted, []).append(word)
+
+    def correct_token(self, token):
+        """Return the best dictionary word for token (token itself if known or uncorrectable)"""
+        token = token.lower()
+        if (token in self.word_counts or token in self.known_words
+                or len(token) < self.min_token_length or token.isdigit()):
+            return token
+
+        cached = self._cache.get(token)
+        if cached is not None:
+            return cached
+
+        # Short tokens only get one edit so "fevr" can't turn into an unrelated word
+        max_distance = 1 if len(token) < 6 else self.max_edit_distance
+        best = token
+        best_key = (max_distance + 1, 0)
+        seen = set()
+        for deleted in _deletes(token, max_distance, self.prefix_length):
+            for candidate in self._index.get(deleted, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(token, candidate, max_distance)
+                key = (distance, -self.word_counts[candidate])
+                if distance <= max_distance and key < best_key:
+                    best, best_key = candidate, key
+
+        if len(self._cache) < self.cache_size:
+            self._cache[token] = best
+        return best
+
+    def correct(self, text):
+        """Correct one text; returns (normalized_text, {original: corrected})"""
+        return self.correct_batch([text])[0]
+
+    def correct_batch(self, texts):
+        """Correct many texts; returns a list of (normalized_text, corrections) pairs"""
+        start = time.perf_counter()
+        tokens = 0
+        corrected = 0
+        results = []
+        for text in texts:
+            corrections = {}
+
+            def replace(match):
+                nonlocal tokens
+                tokens += 1
+                original = match.group(0)
+                fixed = self.correct_token(original)
+                if fixed != original.lower():
+                    corrections[original] = fixed
+                    return fixed
+                return original
+
+            normalized = TOKEN_PATTERN.sub(replace, text)
+            corrected += len(corrections)
+            results.append((normalized, corrections))
+
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._tokens += tokens
+            self._corrected += corrected
+            self._seconds += elapsed
+        return results
+
+    def get_stats(self):
+        """Report dictionary/index size and measured per-token latency"""
+        with self._stats_lock:
+            tokens, corrected, seconds = self._tokens, self._corrected, self._seconds
+        return {
+            'dictionary_size': len(self.word_counts),
+            'known_words': len(self.known_words),
+            'index_size': len(self._index),
+            'tokens_processed': tokens,
+            'tokens_corrected': corrected,
+            'cached_corrections': len(self._cache),
+            'mean_token_latency_us': round(seconds / tokens * 1e6, 3) if tokens else 0.0
+        }
+
+# Words SymptomProcessor looks for outside its phrase lists
+FEATURE_WORDS = ('severe', 'intense', 'extreme', 'days', 'weeks', 'months')
+
+def load_word_list(path):
+    """Read a word list with one word per line, e.g. /usr/share/dict/words"""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        return {line.strip().lower() for line in f if line.strip()}
+
+def build_symptom_corrector(vectorizer, texts=(), known_words=(), **kwargs):
+    """
+    Build a corrector over the vectorizer vocabulary plus the SymptomProcessor
+    phrase lists, weighting words by how often they appear in training texts.
+    English stop words and `known_words` (e.g. a general or medical word list)
+    are never rewritten, but they are not indexed as correction targets either.
+
+    The default of one edit keeps valid words that are merely missing from
+    the small vocabulary ("burning") from being turned into another word
+    ("morning"); a word list protects them at larger distances as well.
+    """
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    from models.medical_ai import SymptomProcessor
+
+    counts = Counter()
+    for text in texts:
+        counts.update(token.lower() for token in TOKEN_PATTERN.findall(text))
+
+    word_counts = {word: counts.get(word, 0) + 1 for word in vectorizer.vocabulary_}
+    for phrases in SymptomProcessor().symptom_categories.values():
+        for phrase in phrases:
+            for word in TOKEN_PATTERN.findall(phrase.lower()):
+                if word not in ENGLISH_STOP_WORDS:
+                    word_counts.setdefault(word, counts.get(word, 0) + 1)
+    for word in FEATURE_WORDS:
+        word_counts.setdefault(word, counts.get(word, 0) + 1)
+
+    return SymSpellCorrector(word_counts, known_words=ENGLISH_STOP_WORDS | frozenset(known_words), **kwargs)
@@ -0,0 +1,134 @@
+"""
+Response helpers for bulk endpoints: NDJSON streaming, NumPy-aware JSON
+encoding and optional gzip
+"""
+
+import json
+import zlib
+
+from flask import Response, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional; it serializes NumPy arrays and scalars natively and is
+# several times faster than the standard library encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def _numpy_default(obj):
+    """Convert NumPy scalars and arrays for the standard library encoder"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj, default=_numpy_default):
+    """Serialize obj to UTF-8 JSON bytes using the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default, separators=(',', ':')).encode('utf-8')
+
+def _provider_default(obj):
+    """NumPy-aware fallback that still handles the types Flask supports"""
+    try:
+        return _numpy_default(obj)
+    except TypeError:
+        return DefaultJSONProvider.default(obj)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider so jsonify() gets NumPy support and the fast encoder"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, default=_provider_default).decode('utf-8')
+
+def accepts_gzip():
+    """Check whether the client negotiated gzip content encoding"""
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+def ndjson_response(records, flush_every=64, compress=None):
+    """
+    Stream an iterable of records as newline-delimited JSON.
+
+    Records are encoded as they are produced, so memory stays flat no matter
+    how many are returned. Output is buffered into chunks of `flush_every`
+    lines and, when the client accepts it, gzip-compressed on the fly.
+    """
+    if compress is None:
+        compress = accepts_gzip()
+
+    def generate():
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        buffer = []
+        for record in records:
+            buffer.append(dumps(record))
+            if len(buffer) >= flush_every:
+                chunk = b'\n'.join(buffer) + b'\n'
+                buffer = []
+                if compressor is not None:
+                    # Sync flush so the client can decode each chunk as it arrives
+                    chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                yield chunk
+
+        chunk = b'\n'.join(buffer) + b'\n' if buffer else b''
+        if compressor is not None:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def iter_request_records(field='records'):
+    """
+    Yield input records from an NDJSON request body (read line by line), a
+    JSON array of records or a JSON object holding that array under `field`.
+
+    A malformed line or a record that is not a JSON object is yielded as a
+    ValueError in its place, so callers can report it and keep going.
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        records = _iter_ndjson_lines(request.stream)
+    else:
+        data = request.get_json(silent=True) or {}
+        if isinstance(data, list):
+            records = data
+        elif isinstance(data, dict):
+            records = data.get(field, [])
+        else:
+            records = [ValueError(f"Request body must be a JSON array or an object with '{field}'")]
+        if not isinstance(records, list):
+            records = [ValueError(f"'{field}' must be a JSON array")]
+
+    for record in records:
+        if not isinstance(record, (dict, ValueError)):
+            record = ValueError('Record must be a JSON object')
+        yield record
+
+def _iter_ndjson_lines(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+def chunked(iterable, size):
+    """Group an iterable into lists of at most `size` items"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,15 +1,7 @@
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
-import joblib
-import os
+import threading
 
 app = Flask(__name__)
 CORS(app)
@@ -20,9 +12,20 @@ class DiseasePredictor:
         self.model = None
         self.vectorizer = None
         self.is_trained = False
-        self.train_model()
+        self._train_lock = threading.Lock()
+    
+    def ensure_trained(self):
+        """Train on first use instead of at import time"""
+        if not self.is_trained:
+            with self._train_lock:
+                if not self.is_trained:
+                    self.train_model()
     
     def train_model(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.pipeline import Pipeline
+        
         # Sample training data (in real scenario, this would be a large medical dataset)
         symptoms_data = [
             "fever headache cough", "Common Cold",
@@ -56,6 +59,7 @@ class DiseasePredictor:
         self.is_trained = True
     
     def predict(self, symptoms_text, age=None, gender=None):
+        self.ensure_trained()
         if not self.is_trained:
             return None
         
@@ -161,6 +165,8 @@ def predict_disease():
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    # Readiness probes warm the model so workers report trained before real traffic
+    predictor.ensure_trained()
     return jsonify({'status': 'healthy', 'model_trained': predictor.is_trained})
 
 # Medical image analysis endpoint (placeholder)
@@ -208,4 +214,5 @@ def check_drug_interactions():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    predictor.ensure_trained()
     app.run(debug=True, host='0.0.0.0', port=5000)
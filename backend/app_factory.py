@@ -12,6 +12,10 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    # NumPy-aware JSON for jsonify(), using orjson when it is installed
+    from api.streaming import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Initialize extensions
     CORS(app)
     
@@ -19,9 +23,29 @@ def create_app(config_name=None):
     from routes.prediction_routes import prediction_bp
     from routes.assessment_routes import assessment_bp
     from routes.analytics_routes import analytics_bp
+    from routes.case_routes import case_bp
+    from routes.shadow_routes import shadow_bp
     
     app.register_blueprint(prediction_bp)
     app.register_blueprint(assessment_bp)
     app.register_blueprint(analytics_bp)
+    app.register_blueprint(case_bp)
+    app.register_blueprint(shadow_bp)
+    
+    # Load the saved ensemble on first use instead of retraining it
+    from routes.prediction_routes import advanced_ai
+    advanced_ai.model_cache_path = app.config.get('MODEL_CACHE_PATH')
+    advanced_ai.spelling_wordlist = app.config.get('SPELLING_WORDLIST')
+    
+    # Severity-aware admission control in front of every /api route
+    if app.config.get('ADMISSION_CONTROL', False):
+        from api.admission import init_admission_control
+        init_admission_control(
+            app, text_normalizer=lambda text: advanced_ai._normalize_symptoms([text])[0][0]
+        )
+    
+    # Sampling profiler hooks run after admission so queue time is not profiled
+    from api.profiler import init_profiler
+    init_profiler(app)
     
     return app
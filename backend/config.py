@@ -6,6 +6,58 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     DEBUG = False
     TESTING = False
+    
+    # Clinician feedback / online learning
+    FEEDBACK_QUEUE_SIZE = int(os.environ.get('FEEDBACK_QUEUE_SIZE', 10000))
+    FEEDBACK_BATCH_SIZE = int(os.environ.get('FEEDBACK_BATCH_SIZE', 32))
+    FEEDBACK_FLUSH_INTERVAL = float(os.environ.get('FEEDBACK_FLUSH_INTERVAL', 1.0))
+    FEEDBACK_COMPACTION_EVERY = int(os.environ.get('FEEDBACK_COMPACTION_EVERY', 500))
+    
+    # Bulk endpoints: records scored per model pass when streaming NDJSON
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 256))
+    
+    # Cross-validated evaluation results served by /api/model-performance
+    EVALUATION_RESULTS_PATH = os.environ.get('EVALUATION_RESULTS_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'evaluation_results.json'
+    )
+    
+    # Trained ensemble saved with joblib and loaded at startup instead of retraining
+    MODEL_CACHE_PATH = os.environ.get('MODEL_CACHE_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'model_cache', 'ensemble.joblib'
+    )
+    
+    # Optional word list (one word per line) whose words spelling correction never rewrites
+    SPELLING_WORDLIST = os.environ.get('SPELLING_WORDLIST')
+    
+    # Similar-case retrieval index (directory of memory-mappable arrays)
+    CASE_INDEX_PATH = os.environ.get('CASE_INDEX_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'case_index'
+    )
+    CASE_INDEX_MAX_K = int(os.environ.get('CASE_INDEX_MAX_K', 100))
+    
+    # Admission control: concurrent request slots; queue limits and queue-time
+    # SLOs (ms) per priority class, keyed 0=critical, 1=high, 2=normal, 3=low
+    ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 8))
+    ADMISSION_QUEUE_LIMITS = {0: 256, 1: 128, 2: 64, 3: 32}
+    ADMISSION_QUEUE_SLO_MS = {0: 10000, 1: 3000, 2: 1000, 3: 250}
+    # Endpoints whose high-severity symptom texts are promoted to critical
+    ADMISSION_PROMOTABLE_ENDPOINTS = ('/api/advanced-predict', '/api/risk-assessment')
+    
+    # Shadow evaluation of candidate models (0 disables sampling)
+    SHADOW_SAMPLE_RATE = float(os.environ.get('SHADOW_SAMPLE_RATE', 0.0))
+    SHADOW_QUEUE_SIZE = int(os.environ.get('SHADOW_QUEUE_SIZE', 1000))
+    SHADOW_BATCH_SIZE = int(os.environ.get('SHADOW_BATCH_SIZE', 32))
+    SHADOW_WORKERS = int(os.environ.get('SHADOW_WORKERS', 2))
+    
+    # On-demand sampling profiler; can also be switched on at runtime via /api/profiler
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'false').lower() == 'true'
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0.0))
+    PROFILER_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', 5.0))
+    PROFILER_ALLOW_HEADER = os.environ.get('PROFILER_ALLOW_HEADER', 'false').lower() == 'true'
+    PROFILER_OUTPUT_DIR = os.environ.get('PROFILER_OUTPUT_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'profiles'
+    )
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -4,7 +4,6 @@ Core Medical AI Models and Utilities
 """
 
 import numpy as np
-import pandas as pd
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.utils.validation import check_X_y, check_array
 from sklearn.utils.multiclass import unique_labels
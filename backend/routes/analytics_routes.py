@@ -1,12 +1,10 @@
 
 from flask import Blueprint, request, jsonify
-from api.advanced_ml import AdvancedMedicalAI
+# Shared with the prediction routes so performance reflects the serving models
+from routes.prediction_routes import advanced_ai
 
 analytics_bp = Blueprint('analytics', __name__)
 
-# Initialize advanced AI system (singleton pattern)
-advanced_ai = AdvancedMedicalAI()
-
 @analytics_bp.route('/api/health-analytics', methods=['POST'])
 def health_analytics():
     try:
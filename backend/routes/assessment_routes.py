@@ -1,12 +1,14 @@
 
-from flask import Blueprint, request, jsonify
-from api.advanced_ml import AdvancedMedicalAI
+from flask import Blueprint, request, jsonify, current_app
+import math
+from api.evaluation import load_evaluation_summary
+from api.profiler import profile_stage
+from api.streaming import ndjson_response, iter_request_records
+# Shared with the prediction routes so feedback updates are reflected here
+from routes.prediction_routes import advanced_ai
 
 assessment_bp = Blueprint('assessment', __name__)
 
-# Initialize advanced AI system (singleton pattern)
-advanced_ai = AdvancedMedicalAI()
-
 @assessment_bp.route('/api/risk-assessment', methods=['POST'])
 def risk_assessment():
     try:
@@ -18,7 +20,8 @@ def risk_assessment():
             'gender': data.get('gender', 'unknown')
         }
         
-        risks = advanced_ai.risk_stratification(patient_data)
+        with profile_stage('risk_stratification'):
+            risks = advanced_ai.risk_stratification(patient_data)
         
         return jsonify({
             'risk_scores': risks,
@@ -34,16 +37,55 @@ def risk_assessment():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@assessment_bp.route('/api/bulk-risk-assessment', methods=['POST'])
+def bulk_risk_assessment():
+    """Stream risk scores for many patients as NDJSON, one line per record"""
+    records = iter_request_records()
+    
+    def generate():
+        index = 0
+        try:
+            for record in records:
+                line = {'index': index}
+                index += 1
+                try:
+                    if isinstance(record, ValueError):
+                        raise record
+                    line['id'] = record.get('id')
+                    age = record.get('age', 30)
+                    symptoms = record.get('symptoms', '')
+                    if isinstance(age, bool) or not isinstance(age, (int, float)) or not math.isfinite(age):
+                        raise ValueError('Age must be a finite number')
+                    if not isinstance(symptoms, str):
+                        raise ValueError('Symptoms must be a string')
+                    line['risk_scores'] = advanced_ai.risk_stratification({'age': age, 'symptoms': symptoms})
+                except Exception as e:
+                    line['error'] = str(e)
+                yield line
+        
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield {'index': index, 'error': str(e)}
+    
+    return ndjson_response(generate())
+
 @assessment_bp.route('/api/model-performance', methods=['GET'])
 def model_performance():
     try:
-        if not advanced_ai.is_trained:
-            advanced_ai.train_ensemble_models()
+        advanced_ai.ensure_trained()
+        
+        # Attach cross-validated metrics when an evaluation run is available
+        evaluation = load_evaluation_summary(current_app.config['EVALUATION_RESULTS_PATH'])
+        performance = {
+            name: dict(perf, cross_validation=evaluation[name]) if name in evaluation else perf
+            for name, perf in advanced_ai.model_performance.items()
+        }
         
         return jsonify({
-            'model_performance': advanced_ai.model_performance,
+            'model_performance': performance,
             'models_available': list(advanced_ai.models.keys()),
             'training_status': 'Trained' if advanced_ai.is_trained else 'Not Trained',
+            'model_version': advanced_ai.model_version,
             'last_updated': advanced_ai.models.get('saved_at', 'Unknown')
         })
     
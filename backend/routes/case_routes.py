@@ -0,0 +1,91 @@
+from flask import Blueprint, request, jsonify, current_app
+import threading
+from api.advanced_ml import load_training_data
+from routes.prediction_routes import advanced_ai
+
+case_bp = Blueprint('cases', __name__)
+
+# Similar-case index (singleton), loaded on first use so numpy stays off the import path
+case_index = None
+_index_lock = threading.Lock()
+
+def get_case_index():
+    global case_index
+    if case_index is None:
+        with _index_lock:
+            if case_index is None:
+                from api.case_index import CaseIndex
+                index = CaseIndex(current_app.config['CASE_INDEX_PATH'])
+                if len(index) == 0:
+                    # Seed an empty index with the labelled training cases
+                    texts, labels = load_training_data()
+                    records = [
+                        {'case_id': f'training-{i}', 'symptoms': text, 'diagnosis': label}
+                        for i, (text, label) in enumerate(zip(texts, labels))
+                    ]
+                    X, feature_names, _ = advanced_ai.vectorize_symptoms(texts)
+                    index.add(records, X, feature_names)
+                case_index = index
+    return case_index
+
+@case_bp.route('/api/similar-cases', methods=['POST'])
+def similar_cases():
+    try:
+        from api.case_index import search_similar_cases
+
+        data = request.json
+        symptoms = data.get('symptoms', '')
+
+        if not symptoms:
+            return jsonify({'error': 'Symptoms are required'}), 400
+
+        try:
+            k = int(data.get('k', 10))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'k must be a positive integer'}), 400
+        if k < 1:
+            return jsonify({'error': 'k must be a positive integer'}), 400
+        k = min(k, current_app.config.get('CASE_INDEX_MAX_K', 100))
+
+        result = search_similar_cases(get_case_index(), advanced_ai, symptoms, k)
+        result['index_size'] = len(get_case_index())
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/api/cases', methods=['POST'])
+def add_cases():
+    try:
+        data = request.json
+        records = data.get('records') or [data]
+
+        records = [record for record in records if record.get('symptoms')]
+        if not records:
+            return jsonify({'error': 'Symptoms are required'}), 400
+
+        X, feature_names, _ = advanced_ai.vectorize_symptoms([record['symptoms'] for record in records])
+        numbers = get_case_index().add(records, X, feature_names)
+
+        return jsonify({'added': len(numbers), 'case_numbers': numbers}), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/api/cases/save', methods=['POST'])
+def save_cases():
+    try:
+        index = get_case_index()
+        saved = index.save()
+        return jsonify({'saved_cases': saved, 'path': index.path, 'stats': index.get_stats()})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@case_bp.route('/api/cases/stats', methods=['GET'])
+def case_stats():
+    try:
+        return jsonify(get_case_index().get_stats())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,12 +1,90 @@
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+import threading
 from api.advanced_ml import AdvancedMedicalAI
+from api.online_learning import FeedbackLearner
+from api.shadow import ShadowEvaluator
+from api.profiler import profile_stage
+from api.streaming import ndjson_response, iter_request_records, chunked
 
 prediction_bp = Blueprint('prediction', __name__)
 
 # Initialize advanced AI system (singleton pattern)
 advanced_ai = AdvancedMedicalAI()
 
+# Background learner for clinician feedback, created on first use
+feedback_learner = None
+_feedback_lock = threading.Lock()
+
+def get_feedback_learner():
+    global feedback_learner
+    if feedback_learner is None:
+        with _feedback_lock:
+            if feedback_learner is None:
+                config = current_app.config
+                feedback_learner = FeedbackLearner(
+                    advanced_ai,
+                    queue_size=config.get('FEEDBACK_QUEUE_SIZE', 10000),
+                    batch_size=config.get('FEEDBACK_BATCH_SIZE', 32),
+                    flush_interval=config.get('FEEDBACK_FLUSH_INTERVAL', 1.0),
+                    compaction_every=config.get('FEEDBACK_COMPACTION_EVERY', 500)
+                )
+    return feedback_learner
+
+# Shadow evaluator for candidate models, created on first use
+shadow_evaluator = None
+_shadow_lock = threading.Lock()
+
+def get_shadow_evaluator():
+    global shadow_evaluator
+    if shadow_evaluator is None:
+        with _shadow_lock:
+            if shadow_evaluator is None:
+                config = current_app.config
+                shadow_evaluator = ShadowEvaluator(
+                    sample_rate=config.get('SHADOW_SAMPLE_RATE', 0.0),
+                    queue_size=config.get('SHADOW_QUEUE_SIZE', 1000),
+                    batch_size=config.get('SHADOW_BATCH_SIZE', 32),
+                    workers=config.get('SHADOW_WORKERS', 2)
+                )
+    return shadow_evaluator
+
+def get_age_group(age_num):
+    """Map a numeric age to the age group used by recommendations"""
+    if age_num >= 65:
+        return 'Senior'
+    elif age_num >= 18:
+        return 'Adult'
+    else:
+        return 'Youth'
+
+def build_prediction_response(prediction_result, symptoms, age_num, age_group):
+    """Combine an ensemble prediction with recommendations and risk scores"""
+    # Get advanced recommendations
+    with profile_stage('recommendations'):
+        recommendations = advanced_ai.get_advanced_recommendations(
+            prediction_result['ensemble_prediction'],
+            'Moderate',
+            age_group
+        )
+    
+    # Risk assessment
+    with profile_stage('risk_stratification'):
+        patient_data = {'age': age_num, 'symptoms': symptoms}
+        risk_scores = advanced_ai.risk_stratification(patient_data)
+    
+    return {
+        'disease': prediction_result['ensemble_prediction'],
+        'confidence': prediction_result['confidence'],
+        'model_agreement': prediction_result['model_agreement'],
+        'individual_predictions': prediction_result['individual_predictions'],
+        'individual_confidences': prediction_result['individual_confidences'],
+        'spelling_corrections': prediction_result.get('spelling_corrections', {}),
+        'recommendations': recommendations,
+        'risk_assessment': risk_scores,
+        'severity': 'High' if prediction_result['confidence'] > 85 else 'Moderate' if prediction_result['confidence'] > 70 else 'Mild'
+    }
+
 @prediction_bp.route('/api/advanced-predict', methods=['POST'])
 def advanced_predict():
     try:
@@ -20,47 +98,103 @@ def advanced_predict():
         
         # Determine age group
         age_num = int(age) if age else 30
-        if age_num >= 65:
-            age_group = 'Senior'
-        elif age_num >= 18:
-            age_group = 'Adult'
-        else:
-            age_group = 'Youth'
+        age_group = get_age_group(age_num)
         
         # Get ensemble prediction
-        prediction_result = advanced_ai.ensemble_predict(
-            symptoms, 
-            age_group=age_group, 
-            severity_hint='Moderate'
-        )
+        with profile_stage('ensemble_predict'):
+            prediction_result = advanced_ai.ensemble_predict(
+                symptoms, 
+                age_group=age_group, 
+                severity_hint='Moderate'
+            )
         
-        # Get advanced recommendations
-        recommendations = advanced_ai.get_advanced_recommendations(
-            prediction_result['ensemble_prediction'],
-            'Moderate',
-            age_group
-        )
+        # Sample this request for candidate models; drops instead of waiting
+        get_shadow_evaluator().maybe_submit(symptoms, prediction_result)
         
-        # Risk assessment
-        patient_data = {'age': age_num, 'symptoms': symptoms}
-        risk_scores = advanced_ai.risk_stratification(patient_data)
-        
-        response = {
-            'disease': prediction_result['ensemble_prediction'],
-            'confidence': prediction_result['confidence'],
-            'model_agreement': prediction_result['model_agreement'],
-            'individual_predictions': prediction_result['individual_predictions'],
-            'individual_confidences': prediction_result['individual_confidences'],
-            'recommendations': recommendations,
-            'risk_assessment': risk_scores,
-            'severity': 'High' if prediction_result['confidence'] > 85 else 'Moderate' if prediction_result['confidence'] > 70 else 'Mild'
-        }
+        response = build_prediction_response(prediction_result, symptoms, age_num, age_group)
         
         return jsonify(response)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@prediction_bp.route('/api/bulk-predict', methods=['POST'])
+def bulk_predict():
+    """Stream predictions for many records as NDJSON, one line per record"""
+    batch_size = current_app.config.get('BULK_BATCH_SIZE', 256)
+    records = iter_request_records()
+    
+    def generate():
+        index = 0
+        try:
+            for batch in chunked(records, batch_size):
+                # Validate every record first; invalid ones get an error line
+                # and are left out of the batch prediction
+                prepared = []
+                for record in batch:
+                    line = {'index': index}
+                    index += 1
+                    try:
+                        if isinstance(record, ValueError):
+                            raise record
+                        line['id'] = record.get('id')
+                        symptoms = record.get('symptoms')
+                        if not symptoms or not isinstance(symptoms, str):
+                            raise ValueError('Symptoms are required')
+                        age_num = int(record.get('age') or 30)
+                    except (TypeError, ValueError, OverflowError) as e:
+                        line['error'] = str(e)
+                        prepared.append((line, None, None))
+                        continue
+                    prepared.append((line, symptoms, age_num))
+                
+                texts = [symptoms for _, symptoms, _ in prepared if symptoms is not None]
+                results = iter(advanced_ai.ensemble_predict_batch(texts) if texts else [])
+                
+                for line, symptoms, age_num in prepared:
+                    if symptoms is not None:
+                        try:
+                            line.update(build_prediction_response(
+                                next(results), symptoms, age_num, get_age_group(age_num)
+                            ))
+                        except Exception as e:
+                            line['error'] = str(e)
+                    yield line
+        
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield {'index': index, 'error': str(e)}
+    
+    return ndjson_response(generate())
+
+@prediction_bp.route('/api/normalize-symptoms', methods=['POST'])
+def normalize_symptoms():
+    """Spell-correct one or many symptom texts without predicting"""
+    try:
+        data = request.json
+        texts = data.get('texts') or ([data['symptoms']] if data.get('symptoms') else [])
+        
+        if not texts:
+            return jsonify({'error': 'Symptoms are required'}), 400
+        
+        advanced_ai.ensure_trained()
+        corrector = advanced_ai.spell_corrector
+        if corrector is None:
+            return jsonify({'error': 'Spelling correction is disabled'}), 503
+        
+        results = corrector.correct_batch(texts)
+        
+        return jsonify({
+            'results': [
+                {'original': text, 'normalized': normalized, 'corrections': corrections}
+                for text, (normalized, corrections) in zip(texts, results)
+            ],
+            'stats': corrector.get_stats()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @prediction_bp.route('/api/treatment-protocol', methods=['POST'])
 def treatment_protocol():
     try:
@@ -84,3 +218,46 @@ def treatment_protocol():
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@prediction_bp.route('/api/feedback', methods=['POST'])
+def submit_feedback():
+    try:
+        data = request.json
+        symptoms = data.get('symptoms', '')
+        predicted = data.get('predicted_disease', '')
+        corrected = data.get('correct_disease', '')
+        
+        if not isinstance(symptoms, str) or not symptoms.strip():
+            return jsonify({'error': 'Symptoms are required'}), 400
+        
+        # A correction wins; otherwise the clinician must confirm the prediction
+        if corrected:
+            label = corrected
+        elif predicted and data.get('confirmed', False):
+            label = predicted
+        else:
+            return jsonify({'error': 'Either correct_disease or a confirmed predicted_disease is required'}), 400
+        
+        if not isinstance(label, str) or not label.strip():
+            return jsonify({'error': 'Disease labels must be non-empty strings'}), 400
+        
+        accepted = get_feedback_learner().submit(symptoms, label)
+        if not accepted:
+            return jsonify({'error': 'Feedback queue is full, try again later'}), 503
+        
+        return jsonify({
+            'status': 'queued',
+            'label': label,
+            'corrected': bool(corrected) and corrected != predicted
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@prediction_bp.route('/api/feedback/status', methods=['GET'])
+def feedback_status():
+    try:
+        return jsonify(get_feedback_learner().get_stats())
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
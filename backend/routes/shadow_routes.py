@@ -0,0 +1,82 @@
+from flask import Blueprint, request, jsonify, current_app
+from api.advanced_ml import AdvancedMedicalAI, MODEL_DEFAULTS, build_model
+from api.evaluation import load_evaluation_summary
+from api.shadow import params_from_evaluation
+from routes.prediction_routes import get_shadow_evaluator
+
+shadow_bp = Blueprint('shadow', __name__)
+
+@shadow_bp.route('/api/shadow/stats', methods=['GET'])
+def shadow_stats():
+    try:
+        return jsonify(get_shadow_evaluator().get_stats())
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@shadow_bp.route('/api/shadow/config', methods=['POST'])
+def shadow_config():
+    try:
+        data = request.json
+        sample_rate = float(data.get('sample_rate', 0.0))
+
+        if not 0.0 <= sample_rate <= 1.0:
+            return jsonify({'error': 'sample_rate must be between 0 and 1'}), 400
+
+        evaluator = get_shadow_evaluator()
+        evaluator.sample_rate = sample_rate
+        return jsonify({'sample_rate': evaluator.sample_rate})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@shadow_bp.route('/api/shadow/candidates', methods=['POST'])
+def register_shadow_candidate():
+    try:
+        data = request.json
+        name = data.get('name', '')
+
+        if not name:
+            return jsonify({'error': 'Candidate name is required'}), 400
+
+        if data.get('from_evaluation', False):
+            summary = load_evaluation_summary(current_app.config['EVALUATION_RESULTS_PATH'])
+            if not summary:
+                return jsonify({'error': 'No evaluation results available'}), 404
+            model_params = params_from_evaluation(summary)
+        else:
+            model_params = data.get('model_params', {})
+
+        unknown = set(model_params) - set(MODEL_DEFAULTS)
+        if unknown:
+            return jsonify({'error': f"Unknown ensemble members: {', '.join(sorted(unknown))}"}), 400
+
+        for member, params in model_params.items():
+            if not isinstance(params, dict):
+                return jsonify({'error': f"model_params for {member} must be an object"}), 400
+            try:
+                build_model(member, **params)
+            except (TypeError, ValueError) as e:
+                return jsonify({'error': f"Invalid parameters for {member}: {e}"}), 400
+
+        # Train now so parameter values the estimators reject are reported here,
+        # not as failed shadow batches; candidates raise instead of falling back
+        candidate = AdvancedMedicalAI(model_params=model_params, fallback_on_error=False)
+        if not candidate.train_ensemble_models():
+            return jsonify({'error': f"Candidate failed to train: {candidate.last_training_error}"}), 400
+
+        get_shadow_evaluator().register_candidate(name, candidate)
+
+        return jsonify({'name': name, 'model_params': model_params}), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@shadow_bp.route('/api/shadow/candidates/<name>', methods=['DELETE'])
+def remove_shadow_candidate(name):
+    try:
+        get_shadow_evaluator().remove_candidate(name)
+        return jsonify({'removed': name})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,33 +1,86 @@
-
+import argparse
 import sys
 import os
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(__file__))
 
-from app_factory import create_app
-from api.advanced_ml import AdvancedMedicalAI
+def warm_up_models():
+    """Load (or train and save) the AI instance shared by the routes so the first request is fast"""
+    from routes.prediction_routes import advanced_ai
+
+    advanced_ai.ensure_trained()
 
 def initialize_ai_system():
     """Initialize AI models on startup"""
     print("Training AI models (this may take a moment)...")
     try:
-        advanced_ai = AdvancedMedicalAI()
-        advanced_ai.train_ensemble_models()
+        warm_up_models()
         print("✓ AI models trained successfully")
         return True
     except Exception as e:
         print(f"⚠ Warning: Could not train models - {e}")
         return False
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Advanced MediAI Backend')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='report import and initialization time per module and phase, then exit')
+    parser.add_argument('--benchmark-startup', type=int, metavar='RUNS',
+                        help='measure cold start over RUNS fresh interpreters, then exit')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='cold-start budget in milliseconds for profiling/benchmarking '
+                             '(import + create_app)')
+    parser.add_argument('--serve-budget-ms', type=float, default=None,
+                        help='time-to-serve budget in milliseconds (cold start + loading the saved '
+                             'ensemble + first prediction)')
+    parser.add_argument('--evaluate', action='store_true',
+                        help='cross-validate the ensemble members and hyperparameter grids, then exit')
+    parser.add_argument('--folds', type=int, default=5,
+                        help='number of stratified folds for --evaluate')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for --evaluate (default: CPU count)')
+    parser.add_argument('--data', metavar='PATH',
+                        help='labelled symptoms file (.csv, .json or .ndjson); required by --evaluate')
+    args = parser.parse_args()
+    if args.evaluate and not args.data:
+        parser.error('--evaluate requires --data: the built-in training data is too small to cross-validate')
+    return args
+
 if __name__ == '__main__':
+    args = parse_args()
+
+    if args.evaluate:
+        from api.evaluation import run_evaluation, load_labelled_samples
+        from config import Config
+        try:
+            run_evaluation(load_labelled_samples(args.data), n_splits=args.folds, workers=args.workers,
+                           results_path=Config.EVALUATION_RESULTS_PATH)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Evaluation not run: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.profile_startup or args.benchmark_startup:
+        import startup_profile
+        budget_ms = args.budget_ms or startup_profile.DEFAULT_COLD_START_BUDGET_MS
+        serve_budget_ms = args.serve_budget_ms or startup_profile.DEFAULT_SERVE_BUDGET_MS
+        if args.profile_startup:
+            within_budget = startup_profile.profile_startup(budget_ms=budget_ms,
+                                                            serve_budget_ms=serve_budget_ms)
+        else:
+            within_budget = startup_profile.benchmark_cold_start(args.benchmark_startup, budget_ms,
+                                                                 serve_budget_ms)
+        sys.exit(0 if within_budget else 1)
+
     print("Starting Advanced MediAI Backend...")
-    
-    # Initialize models on startup
-    initialize_ai_system()
-    
+
     # Create Flask app
+    from app_factory import create_app
     app = create_app('development')
-    
+
+    # Initialize models on startup
+    initialize_ai_system()
+
     print("🚀 Advanced MediAI Backend running on http://localhost:5000")
     app.run(debug=True, host='0.0.0.0', port=5000)
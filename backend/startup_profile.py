@@ -0,0 +1,143 @@
+"""
+Startup profiling and cold-start benchmarking for the backend
+"""
+
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Target for a fresh interpreter to import the app and build it, in milliseconds
+DEFAULT_COLD_START_BUDGET_MS = float(os.environ.get('COLD_START_BUDGET_MS', 500))
+
+# Target for a fresh interpreter to answer its first prediction, including
+# loading the saved ensemble (numpy/scikit-learn imports dominate this)
+DEFAULT_SERVE_BUDGET_MS = float(os.environ.get('SERVE_BUDGET_MS', 1000))
+
+# Code run in a fresh interpreter to measure a worker cold start and time to serve
+COLD_START_SNIPPET = (
+    "import time; t0 = time.perf_counter(); "
+    "from app_factory import create_app; app = create_app('production'); "
+    "t1 = time.perf_counter(); "
+    "from run import warm_up_models; warm_up_models(); "
+    "app.test_client().post('/api/advanced-predict', json={'symptoms': 'fever cough'}); "
+    "print((t1 - t0) * 1000, (time.perf_counter() - t0) * 1000)"
+)
+
+class StartupProfiler:
+    """Record wall-clock time spent in named startup phases"""
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def elapsed_until(self, name):
+        """Cumulative milliseconds from the first phase through the named one"""
+        total = 0.0
+        for phase_name, elapsed_ms in self.phases:
+            total += elapsed_ms
+            if phase_name == name:
+                break
+        return total
+
+    def report(self):
+        print("Startup phases:")
+        for name, elapsed_ms in self.phases:
+            print(f"  - {name}: {elapsed_ms:.1f} ms")
+        print(f"  = total: {sum(ms for _, ms in self.phases):.1f} ms")
+
+def profile_imports(top=15, max_depth=1):
+    """
+    Import the app in a fresh interpreter with -X importtime and return the
+    slowest imports up to max_depth levels deep as
+    (module, cumulative_ms, self_ms) tuples
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app_factory; app_factory.create_app()'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nesting is encoded as two spaces per level after a single separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth > max_depth:
+            continue
+        modules.append((name.strip(), int(cumulative_us) / 1000, int(self_us) / 1000))
+
+    modules.sort(key=lambda module: module[1], reverse=True)
+    return modules[:top]
+
+def benchmark_cold_start(runs=5, budget_ms=DEFAULT_COLD_START_BUDGET_MS,
+                         serve_budget_ms=DEFAULT_SERVE_BUDGET_MS):
+    """
+    Time import + create_app, and the first served prediction, in fresh
+    interpreters and compare both against their budgets. A first, uncounted
+    run populates the saved-model cache the way a previous deploy would.
+    """
+    def run_once():
+        result = subprocess.run(
+            [sys.executable, '-c', COLD_START_SNIPPET],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        cold_ms, serve_ms = result.stdout.strip().splitlines()[-1].split()
+        return float(cold_ms), float(serve_ms)
+
+    run_once()
+    cold_timings, serve_timings = zip(*sorted(run_once() for _ in range(runs)))
+    cold_timings, serve_timings = sorted(cold_timings), sorted(serve_timings)
+
+    within_budget = True
+    for label, timings, budget in (('Cold start', cold_timings, budget_ms),
+                                   ('Time to serve', serve_timings, serve_budget_ms)):
+        median_ms = timings[len(timings) // 2]
+        print(f"{label} over {runs} runs: median {median_ms:.1f} ms, "
+              f"min {timings[0]:.1f} ms, max {timings[-1]:.1f} ms (budget {budget:.0f} ms)")
+        if median_ms <= budget:
+            print(f"✓ {label} within budget")
+        else:
+            print(f"⚠ {label} exceeds budget")
+            within_budget = False
+    return within_budget
+
+def profile_startup(budget_ms=DEFAULT_COLD_START_BUDGET_MS, warm_models=True,
+                    serve_budget_ms=DEFAULT_SERVE_BUDGET_MS):
+    """Report per-module import time and per-phase initialization time"""
+    print("Import time by module (fresh interpreter):")
+    for name, cumulative_ms, self_ms in profile_imports():
+        print(f"  - {name}: {cumulative_ms:.1f} ms (self {self_ms:.1f} ms)")
+
+    profiler = StartupProfiler()
+    with profiler.phase('import app_factory'):
+        from app_factory import create_app
+    with profiler.phase('create_app'):
+        app = create_app('production')
+    if warm_models:
+        from run import warm_up_models
+        with profiler.phase('import numpy + scikit-learn'):
+            import numpy
+            import sklearn.ensemble
+            import sklearn.feature_extraction.text
+            import sklearn.linear_model
+        with profiler.phase('load or train models'):
+            warm_up_models()
+    with profiler.phase('first request'):
+        app.test_client().post('/api/advanced-predict', json={'symptoms': 'fever cough'})
+    profiler.report()
+    # run.py warms the models before binding, so this is when a worker can serve
+    print(f"Time to first served request: {profiler.elapsed_until('first request'):.1f} ms")
+
+    return benchmark_cold_start(budget_ms=budget_ms, serve_budget_ms=serve_budget_ms)
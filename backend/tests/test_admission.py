@@ -0,0 +1,39 @@
+import pytest
+
+from api.admission import CRITICAL, LOW, NORMAL, AdmissionController
+
+@pytest.fixture(scope='module')
+def app():
+    from app_factory import create_app
+    from routes.prediction_routes import advanced_ai
+
+    app = create_app('testing')
+    # Keep test runs from writing the shared model cache
+    advanced_ai.model_cache_path = None
+    return app
+
+@pytest.mark.parametrize('path, expected', [
+    ('/api/advanced-predict', (CRITICAL, True)),
+    ('/api/risk-assessment', (CRITICAL, True)),
+    ('/api/health-analytics', (LOW, False)),
+    ('/api/bulk-risk-assessment', (LOW, False)),
+    ('/api/feedback', (NORMAL, False)),
+])
+def test_only_triage_endpoints_are_promoted(path, expected):
+    controller = AdmissionController()
+    assert controller.classify(path, {'symptoms': 'chest pain and shortness of breath'}) == expected
+
+def test_streamed_response_holds_its_slot_until_closed(app):
+    controller = app.extensions['admission_controller']
+    client = app.test_client()
+    records = [{'symptoms': 'fever cough'} for _ in range(200)]
+
+    response = client.post('/api/bulk-predict', json={'records': records}, buffered=False)
+    body = iter(response.response)
+    assert next(body)
+    # The body is still being produced, so the LOW request must occupy a slot
+    assert controller.get_stats()['in_flight'] == 1
+
+    response.close()
+    assert controller.get_stats()['in_flight'] == 0
+    assert controller.get_stats()['classes']['low']['admitted'] >= 1
@@ -0,0 +1,43 @@
+import pytest
+
+from api import profiler as profiler_module
+
+@pytest.fixture
+def client(monkeypatch):
+    from app_factory import create_app
+    from config import TestingConfig
+    from routes.prediction_routes import advanced_ai
+
+    monkeypatch.setattr(TestingConfig, 'PROFILER_ALLOW_HEADER', True)
+    app = create_app('testing')
+    advanced_ai.model_cache_path = None
+    yield app.test_client()
+    profiler_module.profiler.configure(enabled=False)
+    profiler_module.profiler.reset()
+
+@pytest.mark.parametrize('payload', [
+    {'enabled': 'false'},
+    {'enabled': 1},
+    {'sample_rate': 'abc'},
+    {'interval_ms': 'fast'},
+    {'interval_ms': -1},
+    {'interval_ms': 0},
+    {'sample_rate': 2},
+])
+def test_invalid_settings_are_rejected(client, payload):
+    response = client.post('/api/profiler', json=payload)
+    assert response.status_code == 400
+    assert profiler_module.profiler.enabled is False
+
+def test_streamed_response_is_profiled_until_closed(client):
+    assert client.post('/api/profiler', json={'enabled': True, 'sample_rate': 0.0}).status_code == 200
+    records = [{'symptoms': 'fever cough'} for _ in range(200)]
+
+    response = client.post('/api/bulk-predict', json={'records': records},
+                           headers={'X-Profile': '1'}, buffered=False)
+    assert next(iter(response.response))
+    # The thread producing the body is still registered for sampling
+    assert profiler_module._profiled_threads
+
+    response.close()
+    assert not profiler_module._profiled_threads
@@ -0,0 +1,40 @@
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from api.advanced_ml import VECTORIZER_PARAMS, load_training_data
+from api.spelling import build_symptom_corrector
+
+@pytest.fixture(scope='module')
+def corrector():
+    texts, _ = load_training_data()
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS).fit(texts)
+    return build_symptom_corrector(vectorizer, texts)
+
+@pytest.mark.parametrize('text, expected', [
+    ('hedache', 'headache'),
+    ('diarhea', 'diarrhea'),
+    ('shortnes of breath', 'shortness of breath'),
+    ('feverr and coughh', 'fever and cough'),
+])
+def test_misspellings_are_corrected(corrector, text, expected):
+    normalized, corrections = corrector.correct(text)
+    assert normalized == expected
+    assert corrections
+
+@pytest.mark.parametrize('text', [
+    'burning eyes',
+    'I have a cold',
+    'coff',
+    'tingling fingers',
+])
+def test_valid_out_of_vocabulary_words_are_left_alone(corrector, text):
+    assert corrector.correct(text) == (text, {})
+
+def test_known_words_are_never_rewritten():
+    texts, _ = load_training_data()
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS).fit(texts)
+    # Two edits would turn "burning" into "morning" without the word list
+    assert build_symptom_corrector(vectorizer, texts, max_edit_distance=2).correct('burning')[0] == 'morning'
+    corrector = build_symptom_corrector(vectorizer, texts, known_words={'burning'}, max_edit_distance=2)
+    assert corrector.correct('burning eyes') == ('burning eyes', {})
+    assert corrector.correct('hedache')[0] == 'headache'